@@ -3,6 +3,13 @@ Configuration module for the chess prep backend.
 """
 
 from .logging import setup_logging, get_logger
-from .database import db_manager, get_db, init_database
+from .database import db_manager, get_db, get_db_ro, init_database
 
-__all__ = ["setup_logging", "get_logger", "db_manager", "get_db", "init_database"]
+__all__ = [
+    "setup_logging",
+    "get_logger",
+    "db_manager",
+    "get_db",
+    "get_db_ro",
+    "init_database",
+]
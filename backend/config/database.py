@@ -3,24 +3,109 @@ Database connection configuration and management.
 """
 
 import asyncio
-from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+import hashlib
+from contextlib import AsyncExitStack, asynccontextmanager, nullcontext
+from typing import AsyncGenerator, Optional
 import os
 import logging
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, AsyncEngine
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy import Column, Integer, MetaData, String, Table, delete, event, select, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    AsyncEngine,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool, StaticPool
+from sqlalchemy.schema import CreateIndex, CreateTable
 
 logger = logging.getLogger(__name__)
 
+# Engine-wide compiled statement cache, shared by every session (default 500)
+COMPILED_CACHE_SIZE = 2000
+
+# Persistent PostgreSQL connections, opened up front by warm_pool()
+POSTGRES_POOL_SIZE = 10
+
+# Applied to every new SQLite connection. WAL lets readers proceed while an
+# analysis is being written; NORMAL sync is safe under WAL.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA busy_timeout=30000",
+)
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Tune a freshly opened SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+class _WriteTrackingSession(Session):
+    """Session that remembers whether any non-SELECT statement was executed."""
+
+
+@event.listens_for(_WriteTrackingSession, "do_orm_execute")
+def _track_writes(orm_execute_state):
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info["has_writes"] = True
+
+
+@event.listens_for(_WriteTrackingSession, "after_flush")
+def _track_flushes(session, flush_context):
+    # A flush empties new/dirty/deleted, so remember that it wrote something
+    session.info["has_writes"] = True
+
+
+def _has_pending_writes(session: AsyncSession) -> bool:
+    """Whether committing ``session`` would persist anything."""
+    return bool(
+        session.new
+        or session.dirty
+        or session.deleted
+        or session.info.get("has_writes")
+    )
+
+
+def _redact(database_url: str) -> str:
+    """Mask the password in a database URL so it is safe to log."""
+    return make_url(database_url).render_as_string(hide_password=True)
+
+
+def _sqlite_readonly_url(database_url: str) -> str:
+    """Turn a file-backed SQLite URL into a read-only URI connection URL."""
+    url = make_url(database_url)
+    return url.set(
+        database=f"file:{url.database}",
+        query={**url.query, "mode": "ro", "uri": "true"},
+    ).render_as_string(hide_password=False)
+
 
 class DatabaseManager:
-    """Manages database connections and sessions."""
+    """Manages database connections and sessions.
+
+    For file-backed SQLite databases a single writer connection is guarded by
+    a lock while reads go through separate read-only connections, so readers
+    never queue behind an in-progress write. PostgreSQL uses one pooled engine
+    for both.
+    """
 
     def __init__(self):
         self.engine: AsyncEngine = None
-        self.session_factory: sessionmaker = None
+        self.read_engine: AsyncEngine = None
+        self.session_factory: async_sessionmaker[AsyncSession] = None
+        self.read_session_factory: async_sessionmaker[AsyncSession] = None
+        self._write_lock: Optional[asyncio.Lock] = None
 
     def initialize(self, database_url: str = None, echo: bool = False):
         """Initialize the database connection."""
@@ -36,45 +121,121 @@ class DatabaseManager:
             self.engine = create_async_engine(
                 database_url,
                 echo=echo,
+                query_cache_size=COMPILED_CACHE_SIZE,
                 poolclass=StaticPool,
-                connect_args={"check_same_thread": False},
+                connect_args={"check_same_thread": False, "timeout": 30},
             )
+
+            # In-memory databases have no journal to tune and cannot be
+            # opened a second time, so they keep the single shared connection
+            if ":memory:" not in database_url:
+                event.listen(self.engine.sync_engine, "connect", _set_sqlite_pragmas)
+
+                self.read_engine = create_async_engine(
+                    _sqlite_readonly_url(database_url),
+                    echo=echo,
+                    query_cache_size=COMPILED_CACHE_SIZE,
+                    poolclass=NullPool,
+                    connect_args={"check_same_thread": False, "timeout": 30},
+                )
+                event.listen(
+                    self.read_engine.sync_engine, "connect", _set_sqlite_pragmas
+                )
+                self._write_lock = asyncio.Lock()
         else:
-            # PostgreSQL configuration
+            # PostgreSQL configuration. LIFO checkout keeps a small set of
+            # warm connections in use; overflow absorbs request bursts.
+            connect_args = {}
+            if "asyncpg" in database_url:
+                connect_args = {
+                    "server_settings": {"jit": "off", "application_name": "chess_prep"},
+                    "statement_cache_size": 1024,
+                    "command_timeout": 60,
+                }
             self.engine = create_async_engine(
                 database_url,
                 echo=echo,
-                pool_size=20,
-                max_overflow=0,
+                query_cache_size=COMPILED_CACHE_SIZE,
+                pool_size=POSTGRES_POOL_SIZE,
+                max_overflow=20,
                 pool_pre_ping=True,
-                pool_recycle=300,
+                pool_recycle=1800,
+                pool_use_lifo=True,
+                connect_args=connect_args,
             )
 
         # Create session factory
-        self.session_factory = sessionmaker(
-            self.engine, class_=AsyncSession, expire_on_commit=False
+        self.session_factory = async_sessionmaker(
+            self.engine,
+            expire_on_commit=False,
+            autoflush=False,
+            sync_session_class=_WriteTrackingSession,
         )
+        if self.read_engine is not None:
+            self.read_session_factory = async_sessionmaker(
+                self.read_engine, expire_on_commit=False, autoflush=False
+            )
+        else:
+            self.read_session_factory = self.session_factory
 
-        logger.info(f"Database initialized: {database_url}")
+        logger.info("Database initialized: %s", _redact(database_url))
 
     @asynccontextmanager
-    async def get_session(self) -> AsyncGenerator[AsyncSession, None]:
-        """Get a database session."""
+    async def get_session(
+        self, readonly: bool = False
+    ) -> AsyncGenerator[AsyncSession, None]:
+        """Get a database session.
+
+        Args:
+            readonly: Route the session to the read-only connections
+        """
         if not self.session_factory:
             raise RuntimeError("Database not initialized")
 
-        async with self.session_factory() as session:
-            try:
-                yield session
-                await session.commit()
-            except Exception:
-                await session.rollback()
-                raise
-            finally:
-                await session.close()
+        if readonly:
+            async with self.read_session_factory() as session:
+                try:
+                    yield session
+                finally:
+                    await session.close()
+            return
+
+        async with self._write_lock or nullcontext():
+            async with self.session_factory() as session:
+                try:
+                    yield session
+                    # Read-only use of a write session skips the COMMIT round-trip
+                    if session.in_transaction() and _has_pending_writes(session):
+                        await session.commit()
+                except Exception:
+                    await session.rollback()
+                    raise
+                finally:
+                    await session.close()
+
+    async def warm_pool(self):
+        """Open the pool's persistent connections ahead of the first request.
+
+        Only applies to pooled (PostgreSQL) engines; SQLite keeps a single
+        static connection.
+        """
+        if not self.engine or "sqlite" in self.engine.url.drivername:
+            return
+
+        # Check out every connection at once so the pool has to open them all
+        async with AsyncExitStack() as stack:
+            await asyncio.gather(
+                *(
+                    stack.enter_async_context(self.engine.connect())
+                    for _ in range(POSTGRES_POOL_SIZE)
+                )
+            )
+        logger.info("Database pool warmed with %d connections", POSTGRES_POOL_SIZE)
 
     async def close(self):
         """Close database connections."""
+        if self.read_engine:
+            await self.read_engine.dispose()
         if self.engine:
             await self.engine.dispose()
             logger.info("Database connections closed")
@@ -82,11 +243,12 @@ class DatabaseManager:
     async def health_check(self) -> bool:
         """Check database health."""
         try:
-            async with self.get_session() as session:
-                await session.execute("SELECT 1")
-                return True
+            # Plain connection: no session, no BEGIN/COMMIT round-trips
+            async with self.engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+            return True
         except Exception as e:
-            logger.error(f"Database health check failed: {e}")
+            logger.error("Database health check failed: %s", e)
             return False
 
 
@@ -100,17 +262,64 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
+async def get_db_ro() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency to get a read-only database session."""
+    async with db_manager.get_session(readonly=True) as session:
+        yield session
+
+
+# Fingerprint of the DDL last applied by init_database. Kept outside the
+# models' metadata so it doesn't contribute to its own hash.
+_schema_meta = Table(
+    "_schema_meta",
+    MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("schema_hash", String(64), nullable=False),
+)
+
+
+def _schema_fingerprint(metadata: MetaData, dialect) -> str:
+    """Hash the CREATE TABLE/INDEX DDL that ``metadata`` compiles to."""
+    ddl = []
+    for table in metadata.sorted_tables:
+        ddl.append(str(CreateTable(table).compile(dialect=dialect)))
+        for index in sorted(table.indexes, key=lambda ix: ix.name):
+            ddl.append(str(CreateIndex(index).compile(dialect=dialect)))
+    return hashlib.sha256("|".join(ddl).encode()).hexdigest()
+
+
+def _sync_schema(conn, metadata: MetaData) -> bool:
+    """Create missing tables unless the stored fingerprint is current.
+
+    Returns True if ``create_all`` ran.
+    """
+    fingerprint = _schema_fingerprint(metadata, conn.dialect)
+
+    _schema_meta.create(conn, checkfirst=True)
+    stored = conn.execute(select(_schema_meta.c.schema_hash)).scalar()
+    if stored == fingerprint:
+        return False
+
+    metadata.create_all(conn, checkfirst=True)
+    conn.execute(delete(_schema_meta))
+    conn.execute(_schema_meta.insert().values(id=1, schema_hash=fingerprint))
+    return True
+
+
 async def init_database():
     """Initialize database tables."""
     try:
         # Import models to ensure they're registered
         from database.models import Base
 
-        # Create all tables
+        # Create all tables, skipped when the schema hasn't changed
         async with db_manager.engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
+            created = await conn.run_sync(_sync_schema, Base.metadata)
 
-        logger.info("Database tables initialized")
+        if created:
+            logger.info("Database tables initialized")
+        else:
+            logger.info("Database schema up to date, skipping table creation")
     except Exception as e:
-        logger.error(f"Error initializing database tables: {e}")
+        logger.error("Error initializing database tables: %s", e)
         raise
@@ -2,22 +2,84 @@
 Logging configuration for the application.
 """
 
+import atexit
 import logging
 import logging.config
+import logging.handlers
 import os
+import queue
 from datetime import datetime
+from typing import Optional
 
+DETAILED_FORMAT = "%(asctime)s [%(levelname)s] %(name)s:%(lineno)d: %(message)s"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+LOG_DIR = "logs"
 
-def setup_logging(log_level: str = "INFO"):
-    """Set up logging configuration."""
+# Set once setup_logging has run; dictConfig is not cheap to repeat
+_configured = False
+
+# Background thread that drains queued records into the log file
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def _stop_queue_listener():
+    """Flush and stop the file-writing listener thread."""
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
+def _make_queue_handler(
+    filename: str, max_bytes: int, backup_count: int
+) -> logging.handlers.QueueHandler:
+    """Build a QueueHandler whose records are written to ``filename`` off-thread.
+
+    ``QueueHandler.prepare()`` still runs on the calling thread: it merges
+    the message arguments and renders any ``exc_info`` traceback before the
+    record is queued. The ``DETAILED_FORMAT`` layout, disk writes and
+    rotation happen on the listener thread.
+    """
+    global _queue_listener
+
+    file_handler = logging.handlers.RotatingFileHandler(
+        filename,
+        maxBytes=max_bytes,
+        backupCount=backup_count,
+        encoding="utf8",
+        delay=True,  # Don't open the file until the first record arrives
+    )
+    file_handler.setFormatter(logging.Formatter(DETAILED_FORMAT, DATE_FORMAT))
+
+    log_queue = queue.Queue(-1)
+    _stop_queue_listener()
+    _queue_listener = logging.handlers.QueueListener(
+        log_queue, file_handler, respect_handler_level=True
+    )
+    _queue_listener.start()
+
+    return logging.handlers.QueueHandler(log_queue)
+
+
+atexit.register(_stop_queue_listener)
+
+
+def setup_logging(log_level: str = "INFO", force: bool = False):
+    """Set up logging configuration.
+
+    Only the first call configures logging; pass ``force=True`` to rebuild
+    the configuration anyway.
+    """
+    global _configured
+    if _configured and not force:
+        return
+    _configured = True
 
     # Create logs directory if it doesn't exist
-    log_dir = "logs"
-    if not os.path.exists(log_dir):
-        os.makedirs(log_dir)
+    os.makedirs(LOG_DIR, exist_ok=True)
 
     # Generate log filename with current date
-    log_filename = f"{log_dir}/chess-prep-{datetime.now().strftime('%Y-%m-%d')}.log"
+    log_filename = f"{LOG_DIR}/chess-prep-{datetime.now().strftime('%Y-%m-%d')}.log"
 
     logging_config = {
         "version": 1,
@@ -28,8 +90,8 @@ def setup_logging(log_level: str = "INFO"):
                 "datefmt": "%Y-%m-%d %H:%M:%S",
             },
             "detailed": {
-                "format": "%(asctime)s [%(levelname)s] %(name)s:%(lineno)d: %(message)s",
-                "datefmt": "%Y-%m-%d %H:%M:%S",
+                "format": DETAILED_FORMAT,
+                "datefmt": DATE_FORMAT,
             },
         },
         "handlers": {
@@ -40,13 +102,12 @@ def setup_logging(log_level: str = "INFO"):
                 "stream": "ext://sys.stdout",
             },
             "file": {
-                "class": "logging.handlers.RotatingFileHandler",
+                # Queue in front of a RotatingFileHandler using the detailed format
+                "()": _make_queue_handler,
                 "level": log_level,
-                "formatter": "detailed",
                 "filename": log_filename,
-                "maxBytes": 10485760,  # 10MB
-                "backupCount": 5,
-                "encoding": "utf8",
+                "max_bytes": 104857600,  # 100MB
+                "backup_count": 5,
             },
         },
         "loggers": {
@@ -73,8 +134,8 @@ def setup_logging(log_level: str = "INFO"):
     # Log startup message
     logger = logging.getLogger(__name__)
     logger.info("Logging configured successfully")
-    logger.info(f"Log level: {log_level}")
-    logger.info(f"Log file: {log_filename}")
+    logger.info("Log level: %s", log_level)
+    logger.info("Log file: %s", log_filename)
 
 
 def get_logger(name: str) -> logging.Logger:
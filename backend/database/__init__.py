@@ -5,12 +5,51 @@ Database initialization and migration setup.
 import os
 from alembic.config import Config
 from alembic import command
-from sqlalchemy import create_engine
+from sqlalchemy import bindparam, create_engine, lambda_stmt, select
 
 from .config import SYNC_DATABASE_URL, Base
 from .models import *  # Import all models
 
 
+# Frequently used queries, compiled once and reused via lambda_stmt.
+# Usage: await session.execute(STMT_USER_BY_ID, {"uid": user_id})
+STMT_USER_BY_ID = lambda_stmt(
+    lambda: select(User).where(User.id == bindparam("uid"))
+)
+STMT_USER_BY_USERNAME = lambda_stmt(
+    lambda: select(User).where(User.username == bindparam("username"))
+)
+STMT_PROFILE_BY_ID = lambda_stmt(
+    lambda: select(PlayerProfile).where(PlayerProfile.id == bindparam("profile_id"))
+)
+STMT_PROFILE_BY_PLATFORM_USERNAME = lambda_stmt(
+    lambda: select(PlayerProfile).where(
+        PlayerProfile.platform == bindparam("platform"),
+        PlayerProfile.username == bindparam("username"),
+    )
+)
+STMT_GAMES_BY_PROFILE = lambda_stmt(
+    lambda: select(ChessGame)
+    .where(ChessGame.player_profile_id == bindparam("profile_id"))
+    .order_by(ChessGame.played_at.desc())
+)
+STMT_ANALYSES_BY_USER = lambda_stmt(
+    lambda: select(PlayerAnalysis)
+    .where(PlayerAnalysis.user_id == bindparam("uid"))
+    .order_by(PlayerAnalysis.created_at.desc())
+)
+STMT_PREP_PLANS_BY_USER = lambda_stmt(
+    lambda: select(PrepPlan)
+    .where(PrepPlan.user_id == bindparam("uid"))
+    .order_by(PrepPlan.created_at.desc())
+)
+STMT_SESSIONS_BY_PLAN = lambda_stmt(
+    lambda: select(TrainingSession)
+    .where(TrainingSession.prep_plan_id == bindparam("plan_id"))
+    .order_by(TrainingSession.day_number)
+)
+
+
 def init_database():
     """Initialize the database with all tables."""
     try:
@@ -0,0 +1,8 @@
+"""
+Declarative base shared by all database models.
+"""
+
+from sqlalchemy.ext.declarative import declarative_base
+
+# Base class for models
+Base = declarative_base()
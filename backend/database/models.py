@@ -2,23 +2,89 @@
 Database models for the chess preparation agent.
 """
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, Float, Boolean, ForeignKey, JSON
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import (
+    Column, Integer, String, Text, DateTime, Float, Boolean, ForeignKey, JSON, LargeBinary,
+    Index, UniqueConstraint, desc,
+)
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
+from sqlalchemy.sql.functions import FunctionElement
 from datetime import datetime
-import uuid
+from typing import List, Optional
+import struct
+import zlib
 
-from .config import Base
+import chess
+
+from .base import Base
+
+# Binary JSONB on PostgreSQL (no reparse on read, GIN-indexable), plain JSON elsewhere
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
+
+
+class gen_random_uuid(FunctionElement):
+    """Server-side UUID generation, so inserts don't round-trip Python UUIDs."""
+    type = UUID(as_uuid=True)
+    inherit_cache = True
+
+
+@compiles(gen_random_uuid)
+def _gen_random_uuid_default(element, compiler, **kw):
+    # Built into PostgreSQL 13+
+    return "gen_random_uuid()"
+
+
+@compiles(gen_random_uuid, "sqlite")
+def _gen_random_uuid_sqlite(element, compiler, **kw):
+    # SQLite stores UUIDs as 32 hex characters
+    return "(lower(hex(randomblob(16))))"
+
+
+def _compress_pgn(pgn: str) -> bytes:
+    """Compress PGN text for storage."""
+    return zlib.compress(pgn.encode("utf-8"), 9)
+
+
+def _decompress_pgn(data: bytes) -> str:
+    """Inverse of ``_compress_pgn``."""
+    return zlib.decompress(data).decode("utf-8")
+
+
+def encode_moves(sans: List[str]) -> bytes:
+    """Pack SAN moves from the starting position into 16-bit words.
+
+    Each word is ``from_square << 10 | to_square << 4 | promotion``.
+    """
+    board = chess.Board()
+    words = []
+    for san in sans:
+        move = board.parse_san(san)
+        words.append((move.from_square << 10) | (move.to_square << 4) | (move.promotion or 0))
+        board.push(move)
+    return struct.pack(f">{len(words)}H", *words)
+
+
+def decode_moves(data: bytes) -> List[str]:
+    """Inverse of ``encode_moves``."""
+    board = chess.Board()
+    sans = []
+    for (word,) in struct.iter_unpack(">H", data):
+        move = chess.Move(word >> 10, (word >> 4) & 0x3F, (word & 0xF) or None)
+        sans.append(board.san(move))
+        board.push(move)
+    return sans
 
 
 class User(Base):
     """User account model."""
     __tablename__ = "users"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    username = Column(String(50), unique=True, nullable=False, index=True)
-    email = Column(String(100), unique=True, nullable=False, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=gen_random_uuid())
+    username = Column(String(50), unique=True, nullable=False)
+    email = Column(String(100), unique=True, nullable=False)
     hashed_password = Column(String(255), nullable=False)
     full_name = Column(String(100))
     is_active = Column(Boolean, default=True)
@@ -35,8 +101,12 @@ class User(Base):
 class PlayerProfile(Base):
     """Chess player profile model."""
     __tablename__ = "player_profiles"
+    __table_args__ = (
+        Index('ix_player_profiles_platform_username', 'platform', 'username'),
+        Index('ix_player_profiles_user_platform', 'user_id', 'platform'),
+    )
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=gen_random_uuid())
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     platform = Column(String(20), nullable=False)  # chess.com, lichess, fide
     username = Column(String(50), nullable=False)
@@ -58,8 +128,14 @@ class PlayerProfile(Base):
 class ChessGame(Base):
     """Individual chess game model."""
     __tablename__ = "chess_games"
-    
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    __table_args__ = (
+        UniqueConstraint('platform', 'platform_game_id', name='uq_chess_games_platform_game_id'),
+        Index('ix_chess_games_players', 'white_player', 'black_player'),
+        Index('ix_chess_games_played_at', 'played_at'),
+        Index('ix_chess_games_profile_played_at', 'player_profile_id', desc('played_at')),
+    )
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=gen_random_uuid())
     player_profile_id = Column(UUID(as_uuid=True), ForeignKey("player_profiles.id"))
     platform_game_id = Column(String(50), nullable=False)  # Game ID from the platform
     platform = Column(String(20), nullable=False)
@@ -74,8 +150,9 @@ class ChessGame(Base):
     termination = Column(String(50))
     
     # Game content
-    pgn = Column(Text)
-    moves = Column(JSON)  # Array of moves in SAN
+    pgn = Column(LargeBinary)  # zlib-compressed PGN, use pgn_text to read/write
+    moves = Column(JSONType)  # Array of moves in SAN (legacy, see moves_blob)
+    moves_blob = Column(LargeBinary)  # Moves packed by encode_moves
     opening_eco = Column(String(3))
     opening_name = Column(String(100))
     
@@ -88,23 +165,45 @@ class ChessGame(Base):
     player_profile = relationship("PlayerProfile", back_populates="games")
     game_analysis = relationship("GameAnalysis", back_populates="game", uselist=False)
 
+    @property
+    def pgn_text(self) -> Optional[str]:
+        """PGN as text, decompressed on access."""
+        if self.pgn is None:
+            return None
+        return _decompress_pgn(self.pgn)
+
+    @pgn_text.setter
+    def pgn_text(self, value: Optional[str]):
+        self.pgn = _compress_pgn(value) if value is not None else None
+
+    @property
+    def move_list(self) -> Optional[List[str]]:
+        """SAN moves, from moves_blob when present, else the legacy JSON column."""
+        if self.moves_blob is not None:
+            return decode_moves(self.moves_blob)
+        return self.moves
+
+    @move_list.setter
+    def move_list(self, value: Optional[List[str]]):
+        self.moves_blob = encode_moves(value) if value is not None else None
+
 
 class GameAnalysis(Base):
     """Analysis of a single chess game."""
     __tablename__ = "game_analyses"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=gen_random_uuid())
     game_id = Column(UUID(as_uuid=True), ForeignKey("chess_games.id"), unique=True)
     
     # Analysis results
     total_moves = Column(Integer)
-    analyzed_moves = Column(JSON)  # Array of move analyses
+    analyzed_moves = Column(JSONType)  # Array of move analyses
     white_blunders = Column(Integer, default=0)
     black_blunders = Column(Integer, default=0)
     white_mistakes = Column(Integer, default=0)
     black_mistakes = Column(Integer, default=0)
     average_centipawn_loss = Column(Float)
-    game_phase_breakdown = Column(JSON)  # Opening, middlegame, endgame move counts
+    game_phase_breakdown = Column(JSONType)  # Opening, middlegame, endgame move counts
     
     # Engine info
     engine_used = Column(String(20), default="stockfish")
@@ -122,14 +221,14 @@ class OpeningRepertoire(Base):
     """Opening repertoire for a player."""
     __tablename__ = "opening_repertoires"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=gen_random_uuid())
     player_profile_id = Column(UUID(as_uuid=True), ForeignKey("player_profiles.id"))
     
     # Repertoire data
-    as_white = Column(JSON)  # Array of opening variations
-    as_black_vs_e4 = Column(JSON)
-    as_black_vs_d4 = Column(JSON)
-    as_black_vs_other = Column(JSON)
+    as_white = Column(JSONType)  # Array of opening variations
+    as_black_vs_e4 = Column(JSONType)
+    as_black_vs_d4 = Column(JSONType)
+    as_black_vs_other = Column(JSONType)
     
     # Statistics
     total_games_analyzed = Column(Integer)
@@ -142,8 +241,12 @@ class OpeningRepertoire(Base):
 class PlayerAnalysis(Base):
     """Comprehensive analysis of a player."""
     __tablename__ = "player_analyses"
+    __table_args__ = (
+        Index('ix_player_analyses_user_created', 'user_id', 'created_at'),
+        Index('ix_player_analyses_repertoire_gin', 'opening_repertoire', postgresql_using='gin'),
+    )
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=gen_random_uuid())
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
     player_profile_id = Column(UUID(as_uuid=True), ForeignKey("player_profiles.id"))
     
@@ -152,11 +255,11 @@ class PlayerAnalysis(Base):
     analysis_type = Column(String(20))  # full, opening_only, tactical_only
     
     # Results
-    opening_repertoire = Column(JSON)
-    weakness_patterns = Column(JSON)
-    strength_analysis = Column(JSON)
-    game_statistics = Column(JSON)
-    recommendations = Column(JSON)
+    opening_repertoire = Column(JSONType)
+    weakness_patterns = Column(JSONType)
+    strength_analysis = Column(JSONType)
+    game_statistics = Column(JSONType)
+    recommendations = Column(JSONType)
     
     # Metadata
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -171,8 +274,11 @@ class PlayerAnalysis(Base):
 class PrepPlan(Base):
     """AI-generated preparation plan."""
     __tablename__ = "prep_plans"
+    __table_args__ = (
+        Index('ix_prep_plans_user_status', 'user_id', 'status'),
+    )
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=gen_random_uuid())
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
     player_analysis_id = Column(UUID(as_uuid=True), ForeignKey("player_analyses.id"))
     
@@ -182,13 +288,13 @@ class PrepPlan(Base):
     tournament_date = Column(DateTime(timezone=True))
     
     # Plan content
-    opening_preparation = Column(JSON)
-    tactical_themes = Column(JSON)
-    strategic_focus = Column(JSON)
-    daily_training_plan = Column(JSON)
-    weakness_exploitation = Column(JSON)
-    time_control_strategy = Column(JSON)
-    psychological_notes = Column(JSON)
+    opening_preparation = Column(JSONType)
+    tactical_themes = Column(JSONType)
+    strategic_focus = Column(JSONType)
+    daily_training_plan = Column(JSONType)
+    weakness_exploitation = Column(JSONType)
+    time_control_strategy = Column(JSONType)
+    psychological_notes = Column(JSONType)
     
     # Plan metadata
     confidence_score = Column(Float)
@@ -212,8 +318,11 @@ class PrepPlan(Base):
 class TrainingSession(Base):
     """Individual training session from a prep plan."""
     __tablename__ = "training_sessions"
+    __table_args__ = (
+        Index('ix_training_sessions_plan_day', 'prep_plan_id', 'day_number'),
+    )
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=gen_random_uuid())
     prep_plan_id = Column(UUID(as_uuid=True), ForeignKey("prep_plans.id"))
     
     # Session details
@@ -222,9 +331,9 @@ class TrainingSession(Base):
     focus_area = Column(String(50))
     
     # Session content
-    exercises = Column(JSON)
-    study_materials = Column(JSON)
-    time_allocation = Column(JSON)  # Time for each activity
+    exercises = Column(JSONType)
+    study_materials = Column(JSONType)
+    time_allocation = Column(JSONType)  # Time for each activity
     
     # Progress tracking
     status = Column(String(20), default="pending")  # pending, in_progress, completed, skipped
@@ -244,7 +353,7 @@ class Tournament(Base):
     """Tournament information."""
     __tablename__ = "tournaments"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=gen_random_uuid())
     name = Column(String(100), nullable=False)
     location = Column(String(100))
     start_date = Column(DateTime(timezone=True))
@@ -264,20 +373,3 @@ class Tournament(Base):
     
     # Metadata
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-
-
-# Indexes for better performance
-from sqlalchemy import Index
-
-# Player profile indexes
-Index('ix_player_profiles_platform_username', PlayerProfile.platform, PlayerProfile.username)
-Index('ix_player_profiles_user_platform', PlayerProfile.user_id, PlayerProfile.platform)
-
-# Chess game indexes
-Index('ix_chess_games_platform_game_id', ChessGame.platform, ChessGame.platform_game_id, unique=True)
-Index('ix_chess_games_players', ChessGame.white_player, ChessGame.black_player)
-Index('ix_chess_games_played_at', ChessGame.played_at)
-
-# Analysis indexes
-Index('ix_player_analyses_user_created', PlayerAnalysis.user_id, PlayerAnalysis.created_at)
-Index('ix_prep_plans_user_status', PrepPlan.user_id, PrepPlan.status)
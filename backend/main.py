@@ -4,15 +4,24 @@ FastAPI backend server for AI Chess Tournament Prep Agent.
 
 from fastapi import FastAPI, HTTPException, Depends, status, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.middleware import Middleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
+from cachetools import TTLCache
 from typing import List, Dict, Any, Optional
 from contextlib import asynccontextmanager
-import logging
+from functools import lru_cache
+import asyncio
+import io
 from datetime import datetime
 import os
-import sys
+import secrets
+import time
+
+import chess.pgn
 
 # Import middleware
 from middleware import ErrorHandlerMiddleware, LoggingMiddleware
@@ -24,45 +33,21 @@ from middleware.error_handler import (
 # Import configuration
 from config import setup_logging, get_logger, db_manager, init_database
 
-# Add project root to path for imports
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-# Import our modules
+# Import our modules (installed from the project root with `pip install -e .`)
 from shared.models import Game, Player, PrepPlan as SharedPrepPlan
 from data.fetchers import ChessDataFetcher
 from data.analyzers.chess_engine import ChessAnalyzer, GameAnalysis
-from data.analyzers.opening_analyzer import OpeningAnalyzer, OpeningRepertoire
+from data.analyzers.opening_analyzer import (
+    OpeningAnalyzer,
+    OpeningRepertoire,
+    OpeningVariation,
+)
 from ai.grok_service import GrokAIService, PrepPlan
 
 # Setup logging
 log_level = os.getenv("LOG_LEVEL", "INFO")
 setup_logging(log_level)
 logger = get_logger(__name__)
-logger = logging.getLogger(__name__)
-
-# Initialize FastAPI app
-app = FastAPI(
-    title="AI Chess Tournament Prep Agent",
-    description="Backend API for chess tournament preparation with AI-powered analysis",
-    version="1.0.0",
-)
-
-# CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:5173", "http://localhost:3000"],  # Vite dev server
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Add custom middleware
-app.add_middleware(ErrorHandlerMiddleware)
-app.add_middleware(LoggingMiddleware)
-
-# Add exception handlers
-app.add_exception_handler(HTTPException, http_exception_handler)
-app.add_exception_handler(RequestValidationError, validation_exception_handler)
 
 # Security
 security = HTTPBearer()
@@ -70,6 +55,7 @@ security = HTTPBearer()
 # Configuration
 GROK_API_KEY = os.getenv("GROK_API_KEY", "")
 STOCKFISH_PATH = os.getenv("STOCKFISH_PATH", "")
+OPENING_BOOK_PATH = os.getenv("OPENING_BOOK_PATH", "")
 
 # Global services (will be initialized on startup)
 chess_fetcher: Optional[ChessDataFetcher] = None
@@ -87,11 +73,12 @@ async def lifespan(app: FastAPI):
     try:
         # Initialize database
         database_url = os.getenv("DATABASE_URL")
-        debug_mode = os.getenv("DEBUG", "0") == "1"
-        db_manager.initialize(database_url, echo=debug_mode)
+        sql_echo = os.getenv("SQL_ECHO", "0") == "1"
+        db_manager.initialize(database_url, echo=sql_echo)
 
         # Initialize database tables
         await init_database()
+        await db_manager.warm_pool()
 
         # Initialize data fetcher
         chess_fetcher = ChessDataFetcher()
@@ -99,7 +86,8 @@ async def lifespan(app: FastAPI):
         # Initialize analyzers (only if dependencies are available)
         try:
             chess_analyzer = ChessAnalyzer(
-                stockfish_path=STOCKFISH_PATH if STOCKFISH_PATH else None
+                stockfish_path=STOCKFISH_PATH if STOCKFISH_PATH else None,
+                book_path=OPENING_BOOK_PATH if OPENING_BOOK_PATH else None
             )
         except Exception as e:
             logger.warning(f"Chess analyzer not available: {e}")
@@ -126,6 +114,12 @@ async def lifespan(app: FastAPI):
         if chess_fetcher:
             await chess_fetcher.close()
 
+        if chess_analyzer:
+            await chess_analyzer.close()
+
+        if opening_analyzer:
+            await asyncio.to_thread(opening_analyzer.close)
+
         # Close database connections
         await db_manager.close()
 
@@ -135,14 +129,36 @@ async def lifespan(app: FastAPI):
         logger.error(f"Error during cleanup: {e}")
 
 
+# Middleware stack, outermost first. Large analysis and prep-plan payloads
+# are gzipped inside the logging middleware so it sees what actually goes
+# over the wire.
+middleware = [
+    Middleware(LoggingMiddleware),
+    Middleware(GZipMiddleware, minimum_size=1024),
+    Middleware(ErrorHandlerMiddleware),
+    Middleware(
+        CORSMiddleware,
+        allow_origins=["http://localhost:5173", "http://localhost:3000"],  # Vite dev server
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    ),
+]
+
 # Initialize FastAPI app with lifespan
 app = FastAPI(
     title="AI Chess Tournament Prep Agent",
     description="Backend API for chess tournament preparation with AI-powered analysis",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan,
+    middleware=middleware,
 )
 
+# Add exception handlers
+app.add_exception_handler(HTTPException, http_exception_handler)
+app.add_exception_handler(RequestValidationError, validation_exception_handler)
+
 
 # Request/Response Models
 class PlayerSearchRequest(BaseModel):
@@ -173,6 +189,13 @@ class AnalysisResponse(BaseModel):
     analysis_date: str
 
 
+class AnalysisJob(BaseModel):
+    job_id: str
+    status: str  # "pending", "completed" or "failed"
+    result: Optional[AnalysisResponse] = None
+    error: Optional[str] = None
+
+
 class PrepPlanRequest(BaseModel):
     player_username: str
     opponent_username: str
@@ -189,10 +212,21 @@ class PrepPlanResponse(BaseModel):
     opponent_analysis: Dict[str, Any]
 
 
-# Dependency to get current user (mock for now)
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-):
+def _trusted_response(model: BaseModel) -> ORJSONResponse:
+    """Serialize a response model we built ourselves.
+
+    Returning a Response bypasses FastAPI's response_model validation, which
+    would otherwise re-check every field of an already valid model.
+    """
+    return ORJSONResponse(content=model.model_dump(mode="json"))
+
+
+@lru_cache(maxsize=4096)
+def _decode_token(token: str) -> Dict[str, Any]:
+    """Resolve a bearer token to its user, memoized per token.
+
+    Call ``_decode_token.cache_clear()`` when tokens are revoked (logout).
+    """
     # In a real app, verify the JWT token here
     # For now, return a mock user
     return {"id": "user123", "username": "testuser"}
@@ -202,17 +236,41 @@ async def get_current_user(
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
 ):
-    # In a real app, verify the JWT token here
-    # For now, return a mock user
-    return {"id": "user123", "username": "testuser"}
+    return _decode_token(credentials.credentials)
+
+
+# Last whole second formatted by _iso_now_cached, and its ISO string
+_iso_now_cache = [0, ""]
+
+
+def _iso_now_cached() -> str:
+    """Current local time in ISO format at one-second resolution.
+
+    The string is only rebuilt when the second changes.
+    """
+    second = int(time.time())
+    if second != _iso_now_cache[0]:
+        _iso_now_cache[0] = second
+        _iso_now_cache[1] = datetime.fromtimestamp(second).isoformat()
+    return _iso_now_cache[1]
+
+
+# Database health is cached for this many seconds between probes
+HEALTH_CACHE_TTL = 1.5
+_health_cache = {"checked_at": float("-inf"), "db_healthy": False}
 
 
 # Health check endpoint
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    # Check database health
-    db_healthy = await db_manager.health_check()
+    # Check database health, reusing a recent result so probes don't hit the DB
+    now = time.monotonic()
+    if now - _health_cache["checked_at"] < HEALTH_CACHE_TTL:
+        db_healthy = _health_cache["db_healthy"]
+    else:
+        db_healthy = await db_manager.health_check()
+        _health_cache.update(checked_at=now, db_healthy=db_healthy)
 
     services_status = {
         "database": db_healthy,
@@ -227,7 +285,7 @@ async def health_check():
 
     return {
         "status": "healthy" if overall_healthy else "degraded",
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": _iso_now_cached(),
         "services": services_status,
     }
 
@@ -274,7 +332,7 @@ async def search_player(
 
     try:
         # Fetch player games
-        games = await chess_fetcher.fetch_player_games(
+        games = await chess_fetcher.fetch_player_games_concurrent(
             request.username, request.platform, limit=request.limit or 100
         )
 
@@ -296,7 +354,9 @@ async def search_player(
             country="Unknown",  # Would need additional API call
         )
 
-        return PlayerSearchResponse(player=player, games=games, total_games=len(games))
+        return _trusted_response(
+            PlayerSearchResponse(player=player, games=games, total_games=len(games))
+        )
 
     except Exception as e:
         logger.error(f"Error searching for player: {e}")
@@ -305,142 +365,261 @@ async def search_player(
         )
 
 
-# Analysis endpoints
-@app.post("/api/analysis/player", response_model=AnalysisResponse)
-async def analyze_player(
-    request: AnalysisRequest,
-    background_tasks: BackgroundTasks,
-    current_user: dict = Depends(get_current_user),
-):
-    """Analyze a player's games and generate insights."""
-    if not chess_fetcher or not opening_analyzer:
-        raise HTTPException(status_code=503, detail="Analysis services not available")
+# Analysis results are reused for this long, keyed on the request parameters
+ANALYSIS_CACHE_TTL = 600
+_analysis_cache: TTLCache = TTLCache(maxsize=1024, ttl=ANALYSIS_CACHE_TTL)
+_analysis_cache_lock = asyncio.Lock()
 
-    try:
-        # Fetch player games
-        games = await chess_fetcher.fetch_player_games(
-            request.player_username, request.platform, limit=request.max_games or 50
-        )
+# Requests allowed to use the shared Stockfish process at the same time
+ENGINE_CONCURRENCY = 2
+_engine_semaphore = asyncio.Semaphore(ENGINE_CONCURRENCY)
 
-        if not games:
-            raise HTTPException(status_code=404, detail="No games found for player")
 
-        # Create player object
-        player = Player(
-            name=request.player_username,
-            platform=request.platform,
-            rating=(
-                games[0].white_rating
-                if games[0].white_player.lower() == request.player_username.lower()
-                else games[0].black_rating
-            ),
-        )
+def _variation_summary(v: OpeningVariation) -> Dict[str, Any]:
+    """Serialize a repertoire line for the response (frequency and score)."""
+    return {
+        "eco": v.eco,
+        "name": v.name,
+        "frequency": v.frequency,
+        "win_rate": v.win_rate,
+    }
 
-        # Convert games to analysis format
-        games_data = []
-        for game in games:
-            games_data.append(
-                {
-                    "white": game.white_player,
-                    "black": game.black_player,
-                    "result": game.result,
-                    "pgn": game.pgn,
-                    "moves": [],  # Will be extracted from PGN
-                }
-            )
 
-        # Analyze openings
-        opening_repertoire = None
-        if request.include_openings:
-            repertoire = opening_analyzer.analyze_player_openings(
-                games_data, request.player_username
-            )
-            opening_repertoire = {
-                "as_white": [
-                    {
-                        "eco": v.eco,
-                        "name": v.name,
-                        "frequency": v.frequency,
-                        "win_rate": v.win_rate,
-                        "draw_rate": v.draw_rate,
-                        "loss_rate": v.loss_rate,
-                    }
-                    for v in repertoire.as_white
-                ],
-                "as_black_vs_e4": [
-                    {
-                        "eco": v.eco,
-                        "name": v.name,
-                        "frequency": v.frequency,
-                        "win_rate": v.win_rate,
-                    }
-                    for v in repertoire.as_black_vs_e4
-                ],
-                "as_black_vs_d4": [
-                    {
-                        "eco": v.eco,
-                        "name": v.name,
-                        "frequency": v.frequency,
-                        "win_rate": v.win_rate,
-                    }
-                    for v in repertoire.as_black_vs_d4
-                ],
-            }
+def _variation_detail(v: OpeningVariation) -> Dict[str, Any]:
+    """Like ``_variation_summary``, plus draw and loss rates."""
+    return {
+        "eco": v.eco,
+        "name": v.name,
+        "frequency": v.frequency,
+        "win_rate": v.win_rate,
+        "draw_rate": v.draw_rate,
+        "loss_rate": v.loss_rate,
+    }
 
-        # Analyze weaknesses (if chess engine is available)
-        weaknesses = None
-        if request.include_weaknesses and chess_analyzer:
-            try:
-                async with chess_analyzer as analyzer:
-                    # Analyze a subset of games for weaknesses
-                    pgn_strings = [
-                        game.pgn for game in games[:10]
-                    ]  # Limit to avoid timeout
-                    analyses = await analyzer.analyze_multiple_games(pgn_strings)
-                    if analyses:
-                        weaknesses = analyzer.get_weakness_patterns(
-                            analyses, request.player_username
-                        )
-            except Exception as e:
-                logger.error(f"Error in weakness analysis: {e}")
-
-        # Game statistics
-        total_games = len(games)
-        wins = sum(
-            1
-            for g in games
-            if (
-                g.white_player.lower() == request.player_username.lower()
-                and g.result == "1-0"
-            )
-            or (
-                g.black_player.lower() == request.player_username.lower()
-                and g.result == "0-1"
-            )
+
+def _parse_pgns(pgns: List[str]) -> List[Optional[chess.pgn.Game]]:
+    """Parse PGN strings into python-chess games (None where empty)."""
+    return [chess.pgn.read_game(io.StringIO(pgn)) if pgn else None for pgn in pgns]
+
+
+async def _analyze_player_impl(request: AnalysisRequest) -> AnalysisResponse:
+    """Fetch a player's games and build the full analysis response."""
+    # Fetch player games
+    games = await chess_fetcher.fetch_player_games_concurrent(
+        request.player_username, request.platform, limit=request.max_games or 50
+    )
+
+    if not games:
+        raise HTTPException(status_code=404, detail="No games found for player")
+
+    # Create player object
+    player = Player(
+        name=request.player_username,
+        platform=request.platform,
+        rating=(
+            games[0].white_rating
+            if games[0].white_player.lower() == request.player_username.lower()
+            else games[0].black_rating
+        ),
+    )
+
+    # Parse every PGN once, off the event loop; both analyzers reuse the result
+    parsed_games = await asyncio.to_thread(_parse_pgns, [game.pgn for game in games])
+
+    # Convert games to analysis format
+    games_data = [
+        {
+            "white": game.white_player,
+            "black": game.black_player,
+            "result": game.result,
+            "pgn": game.pgn,
+            "game": parsed,
+        }
+        for game, parsed in zip(games, parsed_games)
+    ]
+
+    async def analyze_openings() -> Optional[OpeningRepertoire]:
+        if not request.include_openings:
+            return None
+        # CPU-bound; keep it off the event loop
+        return await asyncio.to_thread(
+            opening_analyzer.analyze_player_openings,
+            games_data,
+            request.player_username,
         )
-        draws = sum(1 for g in games if g.result == "1/2-1/2")
-        losses = total_games - wins - draws
-
-        game_statistics = {
-            "total_games": total_games,
-            "wins": wins,
-            "draws": draws,
-            "losses": losses,
-            "win_percentage": wins / total_games if total_games > 0 else 0,
-            "performance_rating": player.rating,  # Simplified
+
+    async def analyze_weaknesses() -> Optional[Dict[str, Any]]:
+        if not (request.include_weaknesses and chess_analyzer):
+            return None
+        try:
+            async with _engine_semaphore, chess_analyzer as analyzer:
+                # Analyze a subset of games for weaknesses
+                parsed = [
+                    game for game in parsed_games[:10] if game is not None
+                ]  # Limit to avoid timeout
+                analyses = await analyzer.analyze_multiple_games(parsed)
+                if analyses:
+                    return analyzer.get_weakness_patterns(
+                        analyses, request.player_username
+                    )
+        except Exception as e:
+            logger.error(f"Error in weakness analysis: {e}")
+        return None
+
+    # Opening and weakness analysis are independent, run them concurrently
+    repertoire, weaknesses = await asyncio.gather(
+        analyze_openings(), analyze_weaknesses()
+    )
+
+    opening_repertoire = None
+    if repertoire is not None:
+        opening_repertoire = {
+            "as_white": list(map(_variation_detail, repertoire.as_white)),
+            "as_black_vs_e4": list(
+                map(_variation_summary, repertoire.as_black_vs_e4)
+            ),
+            "as_black_vs_d4": list(
+                map(_variation_summary, repertoire.as_black_vs_d4)
+            ),
         }
 
-        return AnalysisResponse(
-            player=player,
-            opening_repertoire=opening_repertoire,
-            weaknesses=weaknesses,
-            game_statistics=game_statistics,
-            analysis_date=datetime.now().isoformat(),
-        )
+    # Game statistics (single pass over the games)
+    total_games = len(games)
+    username_lower = request.player_username.lower()
+    wins = draws = 0
+    for g in games:
+        result = g.result
+        if result == "1/2-1/2":
+            draws += 1
+        elif result == "1-0":
+            if g.white_player.lower() == username_lower:
+                wins += 1
+        elif result == "0-1":
+            if g.black_player.lower() == username_lower:
+                wins += 1
+    losses = total_games - wins - draws
+
+    game_statistics = {
+        "total_games": total_games,
+        "wins": wins,
+        "draws": draws,
+        "losses": losses,
+        "win_percentage": wins / total_games if total_games > 0 else 0,
+        "performance_rating": player.rating,  # Simplified
+    }
 
+    return AnalysisResponse(
+        player=player,
+        opening_repertoire=opening_repertoire,
+        weaknesses=weaknesses,
+        game_statistics=game_statistics,
+        analysis_date=datetime.now().isoformat(),
+    )
+
+
+async def _analyze_player_cached(request: AnalysisRequest) -> AnalysisResponse:
+    """``_analyze_player_impl`` memoized for ``ANALYSIS_CACHE_TTL`` seconds."""
+    key = (
+        request.player_username.lower(),
+        request.platform.lower(),
+        request.max_games,
+        request.include_openings,
+        request.include_weaknesses,
+    )
+    async with _analysis_cache_lock:
+        cached = _analysis_cache.get(key)
+    if cached is not None:
+        return cached
+
+    response = await _analyze_player_impl(request)
+    async with _analysis_cache_lock:
+        _analysis_cache[key] = response
+    return response
+
+
+# Finished analysis jobs are kept this long for clients to poll. Entries are
+# stored as JSON-ready dicts so polling doesn't re-serialize the result.
+ANALYSIS_JOB_TTL = 3600
+_analysis_jobs: TTLCache = TTLCache(maxsize=4096, ttl=ANALYSIS_JOB_TTL)
+
+
+async def _run_analysis_job(job_id: str, request: AnalysisRequest):
+    """Background task: run a player analysis and record the outcome."""
+    try:
+        result = await _analyze_player_cached(request)
+    except HTTPException as e:
+        job = AnalysisJob(job_id=job_id, status="failed", error=str(e.detail))
     except Exception as e:
         logger.error(f"Error analyzing player: {e}")
-        raise HTTPException(status_code=500, detail=f"Analysis error: {str(e)}")
+        job = AnalysisJob(
+            job_id=job_id, status="failed", error=f"Analysis error: {e}"
+        )
+    else:
+        job = AnalysisJob(job_id=job_id, status="completed", result=result)
+    _analysis_jobs[job_id] = job.model_dump(mode="json")
+
+
+# Analysis endpoints
+@app.post(
+    "/api/analysis/player",
+    response_model=AnalysisJob,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def analyze_player(
+    request: AnalysisRequest,
+    background_tasks: BackgroundTasks,
+    current_user: dict = Depends(get_current_user),
+):
+    """Start analyzing a player's games.
+
+    The analysis runs in the background; poll
+    ``GET /api/analysis/player/{job_id}`` for the result.
+    """
+    if not chess_fetcher or not opening_analyzer:
+        raise HTTPException(status_code=503, detail="Analysis services not available")
+
+    job = AnalysisJob(job_id=secrets.token_hex(8), status="pending")
+    _analysis_jobs[job.job_id] = job.model_dump(mode="json")
+    background_tasks.add_task(_run_analysis_job, job.job_id, request)
+    return ORJSONResponse(
+        content=_analysis_jobs[job.job_id], status_code=status.HTTP_202_ACCEPTED
+    )
+
+
+@app.get("/api/analysis/player/{job_id}", response_model=AnalysisJob)
+async def get_analysis_job(job_id: str, current_user: dict = Depends(get_current_user)):
+    """Get the status, and once completed the result, of a player analysis."""
+    job = _analysis_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Analysis job not found")
+    # Jobs are stored already serialized
+    return ORJSONResponse(content=job)
+
+
+async def _summarize_for_prep(request: AnalysisRequest) -> Dict[str, Any]:
+    """Condense a player analysis into the shape the AI prep plan expects.
+
+    Falls back to an empty profile if the player can't be analyzed.
+    """
+    summary = {
+        "player_name": request.player_username,
+        "rating": None,
+        "repertoire": {},
+        "weaknesses": {},
+    }
+    if not chess_fetcher or not opening_analyzer:
+        return summary
+
+    try:
+        analysis = await _analyze_player_cached(request)
+    except Exception as e:
+        logger.warning(f"Could not analyze {request.player_username}: {e}")
+        return summary
+
+    summary["rating"] = analysis.player.rating
+    summary["repertoire"] = analysis.opening_repertoire or {}
+    summary["weaknesses"] = analysis.weaknesses or {}
+    return summary
 
 
 @app.post("/api/analysis/prep-plan", response_model=PrepPlanResponse)
@@ -452,7 +631,7 @@ async def generate_prep_plan(
         raise HTTPException(status_code=503, detail="AI service not available")
 
     try:
-        # Analyze both players
+        # Analyze both players (cached, so regenerating a plan is cheap)
         player_analysis_req = AnalysisRequest(
             player_username=request.player_username,
             platform=request.player_platform,
@@ -465,21 +644,8 @@ async def generate_prep_plan(
             max_games=30,
         )
 
-        # Get analyses (reuse the existing endpoint logic)
-        # In a real implementation, we'd extract this into a service method
-        player_analysis = {
-            "player_name": request.player_username,
-            "rating": 1500,  # Mock data
-            "repertoire": {},
-            "weaknesses": {},
-        }
-
-        opponent_analysis = {
-            "player_name": request.opponent_username,
-            "rating": 1500,  # Mock data
-            "repertoire": {},
-            "weaknesses": {},
-        }
+        player_analysis = await _summarize_for_prep(player_analysis_req)
+        opponent_analysis = await _summarize_for_prep(opponent_analysis_req)
 
         # Tournament info
         tournament_info = None
@@ -513,10 +679,12 @@ async def generate_prep_plan(
             "created_at": prep_plan.created_at,
         }
 
-        return PrepPlanResponse(
-            prep_plan=prep_plan_dict,
-            player_analysis=player_analysis,
-            opponent_analysis=opponent_analysis,
+        return _trusted_response(
+            PrepPlanResponse(
+                prep_plan=prep_plan_dict,
+                player_analysis=player_analysis,
+                opponent_analysis=opponent_analysis,
+            )
         )
 
     except Exception as e:
@@ -571,4 +739,12 @@ async def get_recent_games(current_user: dict = Depends(get_current_user)):
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=8000, log_level="info")
+    # Single worker: analysis jobs and caches live in process memory
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8000,
+        loop="auto",  # uvloop when installed
+        http="auto",  # httptools when installed
+        log_level="info",
+    )
@@ -5,37 +5,60 @@ Error handling middleware for FastAPI.
 import logging
 from fastapi import Request, HTTPException
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
-import traceback
+from starlette.datastructures import URL
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 logger = logging.getLogger(__name__)
 
 
-class ErrorHandlerMiddleware(BaseHTTPMiddleware):
+class ErrorHandlerMiddleware:
     """Middleware to handle errors globally."""
 
-    async def dispatch(self, request: Request, call_next):
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_tracking_start(message: Message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
         try:
-            response = await call_next(request)
-            return response
-        except HTTPException as exc:
+            await self.app(scope, receive, send_tracking_start)
+        except HTTPException:
             # Re-raise HTTP exceptions to let FastAPI handle them
-            raise exc
+            raise
         except Exception as exc:
-            # Log the error
-            logger.error(f"Unhandled error in {request.method} {request.url}: {exc}")
-            logger.error(traceback.format_exc())
+            # Log the error; the traceback is only formatted if the record is emitted
+            logger.error(
+                "Unhandled error in %s %s: %s",
+                scope["method"],
+                URL(scope=scope),
+                exc,
+                exc_info=True,
+            )
+
+            # Too late to replace a response that is already on the wire
+            if response_started:
+                raise
 
             # Return a generic error response
-            return JSONResponse(
+            response = JSONResponse(
                 status_code=500,
                 content={
                     "error": "Internal server error",
                     "message": "An unexpected error occurred. Please try again later.",
-                    "path": str(request.url.path),
+                    "path": scope["path"],
                 },
             )
+            await response(scope, receive, send)
 
 
 async def http_exception_handler(request: Request, exc: HTTPException):
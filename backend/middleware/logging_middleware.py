@@ -3,41 +3,63 @@ Logging middleware for FastAPI.
 """
 
 import logging
+import os
 import time
-import uuid
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import URL, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 logger = logging.getLogger(__name__)
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
+class LoggingMiddleware:
     """Middleware to log HTTP requests and responses."""
 
-    async def dispatch(self, request: Request, call_next):
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         # Generate a unique request ID
-        request_id = str(uuid.uuid4())[:8]
+        request_id = os.urandom(4).hex()
 
         # Start time
         start_time = time.time()
 
-        # Log the request
-        logger.info(f"[{request_id}] {request.method} {request.url} - Started")
+        method = scope["method"]
+
+        # URL(scope=...) assembles the full URL string, so only build it
+        # when the request is actually going to be logged
+        log_requests = logger.isEnabledFor(logging.INFO)
+        if log_requests:
+            url = URL(scope=scope)
+            logger.info("[%s] %s %s - Started", request_id, method, url)
+
+        status_code = None
+
+        async def send_with_request_id(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Add request ID to response headers
+                MutableHeaders(scope=message).append("X-Request-ID", request_id)
+            await send(message)
 
         # Process the request
-        response = await call_next(request)
+        await self.app(scope, receive, send_with_request_id)
 
         # Calculate processing time
         process_time = time.time() - start_time
 
         # Log the response
-        logger.info(
-            f"[{request_id}] {request.method} {request.url} - "
-            f"Status: {response.status_code} - "
-            f"Time: {process_time:.3f}s"
-        )
-
-        # Add request ID to response headers
-        response.headers["X-Request-ID"] = request_id
-
-        return response
+        if log_requests:
+            logger.info(
+                "[%s] %s %s - Status: %s - Time: %.3fs",
+                request_id,
+                method,
+                url,
+                status_code,
+                process_time,
+            )
@@ -0,0 +1,71 @@
+"""
+Tests for the database session manager.
+"""
+
+import asyncio
+
+from sqlalchemy import Integer, String, func, select
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from config.database import DatabaseManager
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Item(Base):
+    __tablename__ = "items"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    name: Mapped[str] = mapped_column(String(50))
+
+
+async def _count_items(manager: DatabaseManager) -> int:
+    async with manager.get_session(readonly=True) as session:
+        return await session.scalar(select(func.count()).select_from(Item))
+
+
+def _run(tmp_path, write):
+    """Create a file-backed database, apply ``write`` in a write session
+    and return how many items were persisted."""
+
+    async def scenario():
+        manager = DatabaseManager()
+        manager.initialize(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+        try:
+            async with manager.engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+
+            async with manager.get_session() as session:
+                await write(session)
+
+            return await _count_items(manager)
+        finally:
+            await manager.close()
+
+    return asyncio.run(scenario())
+
+
+def test_added_object_is_committed(tmp_path):
+    async def write(session):
+        session.add(Item(name="a"))
+
+    assert _run(tmp_path, write) == 1
+
+
+def test_flushed_object_is_committed(tmp_path):
+    async def write(session):
+        item = Item(name="a")
+        session.add(item)
+        await session.flush()
+        assert item.id is not None
+
+    assert _run(tmp_path, write) == 1
+
+
+def test_read_only_use_commits_nothing(tmp_path):
+    async def write(session):
+        await session.execute(select(Item))
+
+    assert _run(tmp_path, write) == 0
@@ -3,36 +3,73 @@ Chess game analysis engine using python-chess and Stockfish.
 """
 
 import asyncio
+import io
 import os
-from typing import List, Dict, Any, Optional, Tuple
+import pickle
+from collections import Counter, OrderedDict
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple, Union
 from dataclasses import dataclass
 from pathlib import Path
 import tempfile
 import time
 
+import numpy as np
+import pandas as pd
+
 import chess
 import chess.pgn
 import chess.engine
+import chess.polyglot
 from chess.engine import SimpleEngine, Limit
 
 
-@dataclass
+# Only depth and score are read back; skipping PV parsing saves replaying
+# every principal variation the engine reports on the Python side
+ANALYSIS_INFO = chess.engine.INFO_BASIC | chess.engine.INFO_SCORE
+
+
+def _score_to_cp(score: chess.engine.Score) -> Optional[int]:
+    """Convert an engine score, from the side to move's view, to centipawns."""
+    if isinstance(score, chess.engine.Mate):
+        # Convert mate scores to large centipawn values
+        mate_in = score.moves
+        if mate_in > 0:
+            return 10000 - mate_in * 10  # Winning mate
+        return -10000 - mate_in * 10  # Losing mate
+    # Regular centipawn score
+    return score.score()
+
+
+# Game phases are stored as indices into PHASES; names are only used in
+# reports
+PHASE_OPENING, PHASE_MIDDLEGAME, PHASE_ENDGAME = 0, 1, 2
+PHASES = ("opening", "middlegame", "endgame")
+
+# Decisive and drawn results, as they appear in PGN Result headers
+RESULTS = ("1-0", "0-1", "1/2-1/2")
+
+# Safety cap on moves analyzed per game
+MAX_ANALYZED_MOVES = 200
+
+
+@dataclass(slots=True)
 class MoveAnalysis:
     """Analysis of a single move."""
     move_number: int
     move: str
-    fen_before: str
-    fen_after: str
+    fen_before: Optional[str] = None  # Only recorded for blunders and mistakes
+    fen_after: Optional[str] = None
     eval_before: Optional[float] = None  # In centipawns
     eval_after: Optional[float] = None
     eval_change: Optional[float] = None
     is_blunder: bool = False
     is_mistake: bool = False
     best_move: Optional[str] = None
-    phase: str = "unknown"  # opening, middlegame, endgame
+    phase: int = PHASE_OPENING  # Index into PHASES
+    zobrist: int = 0  # Polyglot hash of the position before the move
 
 
-@dataclass
+@dataclass(slots=True)
 class GameAnalysis:
     """Complete analysis of a chess game."""
     game_id: Optional[str] = None
@@ -49,32 +86,89 @@ class GameAnalysis:
     black_mistakes: int = 0
     average_centipawn_loss: float = 0.0
     game_phase_breakdown: Dict[str, int] = None
+    # Per-move columns parallel to analyzed_moves, for vectorized aggregation.
+    # phase_arr indexes PHASES; eval_change_arr is NaN where not evaluated.
+    move_number_arr: np.ndarray = None
+    phase_arr: np.ndarray = None
+    eval_change_arr: np.ndarray = None
+    is_blunder_arr: np.ndarray = None
+    is_mistake_arr: np.ndarray = None
     
     def __post_init__(self):
         if self.analyzed_moves is None:
             self.analyzed_moves = []
         if self.game_phase_breakdown is None:
             self.game_phase_breakdown = {"opening": 0, "middlegame": 0, "endgame": 0}
-
+        if self.move_number_arr is None:
+            self.move_number_arr = np.empty(0, dtype=np.int16)
+        if self.phase_arr is None:
+            self.phase_arr = np.empty(0, dtype=np.int8)
+        if self.eval_change_arr is None:
+            self.eval_change_arr = np.empty(0, dtype=np.float32)
+        if self.is_blunder_arr is None:
+            self.is_blunder_arr = np.empty(0, dtype=bool)
+        if self.is_mistake_arr is None:
+            self.is_mistake_arr = np.empty(0, dtype=bool)
+    
+    def to_row(self) -> Dict[str, Any]:
+        """Flatten the game-level fields into a table row."""
+        return {
+            "opening_eco": self.opening_eco,
+            "opening_name": self.opening_name or "Unknown",
+            "result": self.result,
+            "total_blunders": self.white_blunders + self.black_blunders,
+            "total_mistakes": self.white_mistakes + self.black_mistakes,
+        }
 
 class ChessAnalyzer:
     """Chess game analyzer using Stockfish engine."""
     
     def __init__(self, stockfish_path: Optional[str] = None, 
                  analysis_time: float = 1.0,
-                 depth: int = 15):
+                 depth: int = 15,
+                 threads: int = 1,
+                 hash_mb: int = 64,
+                 workers: Optional[int] = None,
+                 tt_size: int = 1_000_000,
+                 tt_path: Optional[str] = None,
+                 book_path: Optional[str] = None):
         """
         Initialize the chess analyzer.
         
         Args:
             stockfish_path: Path to Stockfish binary
-            analysis_time: Time in seconds to analyze each position
+            analysis_time: Upper bound in seconds on each position's search
             depth: Search depth for analysis
+            threads: Stockfish search threads per engine. Stockfish's
+                parallel search scales poorly, so one single-threaded
+                engine per CPU analyzes games faster than fewer wide ones.
+            hash_mb: Stockfish transposition table size in MB, per engine
+            workers: Number of Stockfish processes (defaults to CPU count)
+            tt_size: Maximum positions kept in the evaluation cache
+            tt_path: File the evaluation cache is loaded from and saved to
+            book_path: Polyglot opening book; positions found in it are
+                scored as equal instead of being searched
         """
         self.stockfish_path = stockfish_path or self._find_stockfish()
         self.analysis_time = analysis_time
         self.depth = depth
-        self.engine: Optional[SimpleEngine] = None
+        self.hash_mb = hash_mb
+        self.workers = workers or os.cpu_count() or 1
+        self.threads = threads
+        self.engines: List[SimpleEngine] = []
+        self._engine_pool: Optional[asyncio.Queue] = None
+        self._start_lock = asyncio.Lock()
+        
+        # Evaluation cache: Zobrist hash -> (eval in centipawns, search depth),
+        # least recently used first
+        self.tt_size = tt_size
+        self.tt_path = tt_path
+        self._tt: "OrderedDict[int, Tuple[float, int]]" = self._load_tt()
+        # Searches currently running, by Zobrist hash
+        self._in_flight: Dict[int, asyncio.Future] = {}
+        
+        # Book positions are known theory, not worth an engine search
+        self._book = chess.polyglot.open_reader(book_path) if book_path else None
         
         # Analysis thresholds (in centipawns)
         self.blunder_threshold = 300
@@ -105,66 +199,174 @@ class ChessAnalyzer:
             "or ensure it's available in your system PATH."
         )
     
+    @property
+    def engine(self) -> Optional[SimpleEngine]:
+        """The first engine of the pool, used for one-off position analysis."""
+        return self.engines[0] if self.engines else None
+    
+    def _start_engine(self) -> SimpleEngine:
+        """Launch and configure one Stockfish process."""
+        engine = chess.engine.SimpleEngine.popen_uci(self.stockfish_path)
+        engine.configure({"Threads": self.threads, "Hash": self.hash_mb})
+        return engine
+    
     async def __aenter__(self):
-        """Async context manager entry."""
-        self.engine = chess.engine.SimpleEngine.popen_uci(self.stockfish_path)
+        """Async context manager entry.
+        
+        The Stockfish processes are started on first use and then kept alive
+        across uses; call close() to shut them down.
+        """
+        async with self._start_lock:
+            if not self.engines:
+                self.engines = list(await asyncio.gather(
+                    *(asyncio.to_thread(self._start_engine) for _ in range(self.workers))
+                ))
+                self._engine_pool = asyncio.Queue()
+                for engine in self.engines:
+                    self._engine_pool.put_nowait(engine)
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit."""
-        if self.engine:
-            self.engine.quit()
+        pass
+    
+    async def close(self):
+        """Shut down the Stockfish processes and persist the evaluation cache."""
+        for engine in self.engines:
+            engine.quit()
+        self.engines = []
+        self._engine_pool = None
+        if self._book:
+            self._book.close()
+            self._book = None
+        self._save_tt()
+    
+    def _load_tt(self) -> "OrderedDict[int, Tuple[float, int]]":
+        """Load the evaluation cache from tt_path, if there is one."""
+        if self.tt_path and os.path.exists(self.tt_path):
+            try:
+                with open(self.tt_path, "rb") as f:
+                    return OrderedDict(pickle.load(f))
+            except Exception as e:
+                print(f"Error loading evaluation cache: {e}")
+        return OrderedDict()
+    
+    def _save_tt(self):
+        """Write the evaluation cache to tt_path, if configured."""
+        if not self.tt_path:
+            return
+        # Dump next to the target and swap it in, so an interrupted write
+        # never leaves a truncated cache behind
+        directory = os.path.dirname(os.path.abspath(self.tt_path))
+        tmp_path = None
+        try:
+            with tempfile.NamedTemporaryFile(
+                "wb", dir=directory, suffix=".tmp", delete=False
+            ) as f:
+                tmp_path = f.name
+                pickle.dump(dict(self._tt), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.tt_path)
+        except Exception as e:
+            print(f"Error saving evaluation cache: {e}")
+            if tmp_path and os.path.exists(tmp_path):
+                os.unlink(tmp_path)
     
-    def _get_game_phase(self, board: chess.Board) -> str:
+    def _get_game_phase(self, board: chess.Board) -> int:
         """Determine the phase of the game based on material and moves."""
         move_count = len(board.move_stack)
         
-        # Count pieces (excluding kings and pawns)
-        piece_count = 0
-        for piece_type in [chess.QUEEN, chess.ROOK, chess.BISHOP, chess.KNIGHT]:
-            piece_count += len(board.pieces(piece_type, chess.WHITE))
-            piece_count += len(board.pieces(piece_type, chess.BLACK))
-        
         if move_count <= 15:
-            return "opening"
-        elif piece_count >= 12 or move_count <= 40:
-            return "middlegame"
+            return PHASE_OPENING
+        
+        # Count pieces (excluding kings and pawns) straight off the bitboards
+        piece_count = chess.popcount(board.occupied & ~board.kings & ~board.pawns)
+        
+        if piece_count >= 12 or move_count <= 40:
+            return PHASE_MIDDLEGAME
         else:
-            return "endgame"
+            return PHASE_ENDGAME
     
-    async def analyze_position(self, board: chess.Board) -> Optional[float]:
-        """Analyze a single position and return evaluation in centipawns."""
-        if not self.engine:
+    async def analyze_position(self, board: chess.Board,
+                               engine: Optional[SimpleEngine] = None,
+                               game: object = None,
+                               key: Optional[int] = None) -> Optional[float]:
+        """Analyze a single position and return evaluation in centipawns.
+        
+        Results are cached by Zobrist hash; a cached evaluation is reused if
+        it was searched at least as deep as self.depth.
+        
+        ``game`` identifies the game the position belongs to. The engine is
+        only sent ucinewgame (which clears its hash table) when it changes,
+        so positions of the same game reuse each other's search.
+        
+        ``key`` is the board's Zobrist hash, if the caller already has it.
+        Concurrent requests for the same position share a single search.
+        
+        Positions in the opening book, if one is configured, evaluate to 0
+        without consulting the engine.
+        """
+        engine = engine or self.engine
+        if not engine:
             return None
         
+        if self._book is not None and self._book.get(board) is not None:
+            return 0
+        
+        if key is None:
+            key = chess.polyglot.zobrist_hash(board)
+        cached = self._tt.get(key)
+        if cached is not None and cached[1] >= self.depth:
+            self._tt.move_to_end(key)
+            return cached[0]
+        
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            # Shielded so a cancelled waiter doesn't cancel the shared search
+            return await asyncio.shield(pending)
+        
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        evaluation = None
         try:
-            # Use time-based limit for analysis
-            limit = Limit(time=self.analysis_time)
-            info = self.engine.analyse(board, limit)
-            
-            score = info["score"]
+            evaluation = await self._search(board, engine, game, key)
+        finally:
+            del self._in_flight[key]
+            future.set_result(evaluation)
+        return evaluation
+    
+    async def _search(self, board: chess.Board, engine: SimpleEngine,
+                      game: object, key: int) -> Optional[float]:
+        """Run the engine on a position and store the result in the cache."""
+        try:
+            # Search to a fixed depth so easy positions finish early; the
+            # time limit only caps pathological ones
+            limit = Limit(depth=self.depth, time=self.analysis_time)
+            # Blocking call; run it in a thread so engines can work in parallel
+            info = await asyncio.to_thread(
+                engine.analyse, board, limit, game=game, info=ANALYSIS_INFO
+            )
             
-            # Convert score to centipawns from the perspective of the side to move
-            if score.is_mate():
-                # Convert mate scores to large centipawn values
-                mate_in = score.mate()
-                if mate_in > 0:
-                    return 10000 - mate_in * 10  # Winning mate
-                else:
-                    return -10000 - mate_in * 10  # Losing mate
-            else:
-                # Regular centipawn score
-                return score.relative.score()
+            evaluation = _score_to_cp(info["score"].relative)
         
         except Exception as e:
             print(f"Error analyzing position: {e}")
             return None
+        
+        self._tt[key] = (evaluation, info.get("depth", 0))
+        self._tt.move_to_end(key)
+        if len(self._tt) > self.tt_size:
+            self._tt.popitem(last=False)
+        return evaluation
     
-    async def analyze_game(self, pgn_string: str) -> Optional[GameAnalysis]:
-        """Analyze a complete chess game from PGN."""
+    async def analyze_game(self, pgn: Union[str, chess.pgn.Game],
+                           engine: Optional[SimpleEngine] = None) -> Optional[GameAnalysis]:
+        """Analyze a complete chess game from a PGN string or parsed game."""
         try:
-            # Parse the PGN
-            game = chess.pgn.read_game(chess.io.StringIO(pgn_string))
+            # Parse the PGN unless the caller already did
+            if isinstance(pgn, chess.pgn.Game):
+                game = pgn
+            else:
+                game = chess.pgn.read_game(io.StringIO(pgn))
             if not game:
                 return None
             
@@ -178,95 +380,97 @@ class ChessAnalyzer:
                 opening_name=headers.get("Opening")
             )
             
-            # Analyze the game move by move
+            # Pass 1: walk the game, evaluating each position once. The
+            # evaluation after a move is the evaluation before the next one.
             board = game.board()
-            move_analyses = []
-            
-            prev_eval = None
-            move_number = 0
+            moves = []
+            san_moves = []
+            phases = []
+            keys = [chess.polyglot.zobrist_hash(board)]
+            evals = [await self.analyze_position(board, engine, game, keys[0])]
+            turns_after = []
             
             for move in game.mainline_moves():
-                move_number += 1
-                
-                # Get position before move
-                fen_before = board.fen()
-                phase = self._get_game_phase(board)
-                
-                # Analyze position before move
-                eval_before = await self.analyze_position(board)
-                
-                # Make the move
-                san_move = board.san(move)
+                phases.append(self._get_game_phase(board))
+                san_moves.append(board.san(move))
                 board.push(move)
-                
-                # Analyze position after move
-                eval_after = await self.analyze_position(board)
-                
-                # Calculate evaluation change
-                eval_change = None
-                is_blunder = False
-                is_mistake = False
-                
-                if eval_before is not None and eval_after is not None:
-                    # Flip evaluation if it's Black's turn (eval_after is from White's perspective)
-                    if not board.turn:  # Black just moved
-                        eval_change = eval_before - (-eval_after)
-                    else:  # White just moved
-                        eval_change = eval_before - eval_after
-                    
-                    # Check for blunders and mistakes
-                    if eval_change > self.blunder_threshold:
-                        is_blunder = True
-                        if not board.turn:  # Black just moved
-                            analysis.black_blunders += 1
-                        else:  # White just moved
-                            analysis.white_blunders += 1
-                    elif eval_change > self.mistake_threshold:
-                        is_mistake = True
-                        if not board.turn:
-                            analysis.black_mistakes += 1
-                        else:
-                            analysis.white_mistakes += 1
-                
-                # Get best move (optional - takes more time)
-                best_move = None
-                # if is_blunder or is_mistake:
-                #     best_moves = self.engine.analyse(chess.Board(fen_before), Limit(time=self.analysis_time), multipv=1)
-                #     if best_moves:
-                #         best_move = best_moves["pv"][0].uci()
-                
-                # Create move analysis
-                move_analysis = MoveAnalysis(
-                    move_number=move_number,
-                    move=san_move,
-                    fen_before=fen_before,
-                    fen_after=board.fen(),
-                    eval_before=eval_before,
-                    eval_after=eval_after,
-                    eval_change=eval_change,
-                    is_blunder=is_blunder,
-                    is_mistake=is_mistake,
-                    best_move=best_move,
-                    phase=phase
+                moves.append(move)
+                keys.append(chess.polyglot.zobrist_hash(board))
+                evals.append(
+                    await self.analyze_position(board, engine, game, keys[-1])
                 )
-                
-                move_analyses.append(move_analysis)
-                analysis.game_phase_breakdown[phase] += 1
-                
-                prev_eval = eval_after
+                turns_after.append(board.turn)
                 
                 # Break if analysis is taking too long (safety measure)
-                if move_number > 200:  # Reasonable limit
+                if len(moves) > MAX_ANALYZED_MOVES:
                     break
             
+            # Pass 2: classify every move at once. eval_before - eval_after,
+            # with eval_after negated when Black is to move after the move.
+            n = len(moves)
+            eval_arr = np.array(
+                [np.nan if e is None else e for e in evals], dtype=np.float64
+            )
+            turn_arr = np.array(turns_after, dtype=bool)
+            signs = np.where(turn_arr, 1.0, -1.0)
+            eval_change = eval_arr[:-1] - signs * eval_arr[1:]
+            is_blunder = eval_change > self.blunder_threshold
+            is_mistake = (eval_change > self.mistake_threshold) & ~is_blunder
+            
+            analysis.black_blunders = int((~turn_arr & is_blunder).sum())
+            analysis.white_blunders = int((turn_arr & is_blunder).sum())
+            analysis.black_mistakes = int((~turn_arr & is_mistake).sum())
+            analysis.white_mistakes = int((turn_arr & is_mistake).sum())
+            
+            # FENs are only recorded for flagged moves, the only ones
+            # reported back; replay the game up to the last of them
+            fens = {}
+            flagged = np.flatnonzero(is_blunder | is_mistake)
+            if flagged.size:
+                board = game.board()
+                wanted = set(flagged.tolist())
+                for i, move in enumerate(moves[:flagged[-1] + 1]):
+                    if i in wanted:
+                        fen_before = board.fen()
+                        board.push(move)
+                        fens[i] = (fen_before, board.fen())
+                    else:
+                        board.push(move)
+            
+            move_analyses = []
+            for i in range(n):
+                change = eval_change[i]
+                fen_before, fen_after = fens.get(i, (None, None))
+                move_analyses.append(MoveAnalysis(
+                    move_number=i + 1,
+                    move=san_moves[i],
+                    fen_before=fen_before,
+                    fen_after=fen_after,
+                    eval_before=evals[i],
+                    eval_after=evals[i + 1],
+                    eval_change=None if np.isnan(change) else float(change),
+                    is_blunder=bool(is_blunder[i]),
+                    is_mistake=bool(is_mistake[i]),
+                    best_move=None,  # Would need a second, multipv search
+                    phase=phases[i],
+                    zobrist=keys[i]
+                ))
+            
             analysis.analyzed_moves = move_analyses
-            analysis.total_moves = move_number
+            analysis.total_moves = n
+            analysis.move_number_arr = np.arange(1, n + 1, dtype=np.int16)
+            analysis.phase_arr = np.array(phases, dtype=np.int8)
+            analysis.game_phase_breakdown = dict(zip(
+                PHASES, np.bincount(analysis.phase_arr, minlength=len(PHASES)).tolist()
+            ))
+            analysis.eval_change_arr = eval_change.astype(np.float32)
+            analysis.is_blunder_arr = is_blunder
+            analysis.is_mistake_arr = is_mistake
             
             # Calculate average centipawn loss
-            total_loss = sum(ma.eval_change for ma in move_analyses if ma.eval_change is not None)
-            analyzed_moves_count = len([ma for ma in move_analyses if ma.eval_change is not None])
-            if analyzed_moves_count > 0:
-                analysis.average_centipawn_loss = total_loss / analyzed_moves_count
+            evaluated = analysis.eval_change_arr[~np.isnan(analysis.eval_change_arr)]
+            if evaluated.size > 0:
+                analysis.average_centipawn_loss = float(evaluated.mean(dtype=np.float64))
             
             return analysis
         
@@ -274,108 +478,161 @@ class ChessAnalyzer:
             print(f"Error analyzing game: {e}")
             return None
     
-    async def analyze_multiple_games(self, pgn_strings: List[str]) -> List[GameAnalysis]:
-        """Analyze multiple games."""
-        analyses = []
+    async def analyze_multiple_games(self, pgns: List[Union[str, chess.pgn.Game]]) -> List[GameAnalysis]:
+        """Analyze multiple games, given as PGN strings or parsed games.
         
-        for i, pgn in enumerate(pgn_strings):
-            print(f"Analyzing game {i + 1}/{len(pgn_strings)}...")
-            analysis = await self.analyze_game(pgn)
-            if analysis:
-                analyses.append(analysis)
+        Games are handed out to one worker per pooled engine; each worker
+        checks its engine out once and analyzes games until none are left.
+        """
+        pool = self._engine_pool
+        if pool is None:
+            results = [await self.analyze_game(pgn) for pgn in pgns]
+            return [analysis for analysis in results if analysis]
         
-        return analyses
+        results: List[Optional[GameAnalysis]] = [None] * len(pgns)
+        pending = iter(enumerate(pgns))
+        
+        async def worker() -> None:
+            engine = await pool.get()
+            try:
+                for i, pgn in pending:
+                    print(f"Analyzing game {i + 1}/{len(pgns)}...")
+                    results[i] = await self.analyze_game(pgn, engine)
+            finally:
+                pool.put_nowait(engine)
+        
+        await asyncio.gather(*(worker() for _ in range(min(self.workers, len(pgns)))))
+        return [analysis for analysis in results if analysis]
+    
+    async def analyze_pgn_file(self, path: str) -> AsyncIterator[GameAnalysis]:
+        """Analyze every game in a PGN file, reading it one game at a time."""
+        with open(path, encoding="utf-8-sig", errors="replace") as pgn_file:
+            while (game := chess.pgn.read_game(pgn_file)) is not None:
+                analysis = await self.analyze_game(game)
+                if analysis:
+                    yield analysis
     
     def get_opening_statistics(self, analyses: List[GameAnalysis]) -> Dict[str, Any]:
         """Get statistics about openings from analyzed games."""
-        opening_stats = {}
+        rows = [analysis.to_row() for analysis in analyses if analysis.opening_eco]
+        if not rows:
+            return {}
         
-        for analysis in analyses:
-            if analysis.opening_eco:
-                eco = analysis.opening_eco
-                if eco not in opening_stats:
-                    opening_stats[eco] = {
-                        'count': 0,
-                        'name': analysis.opening_name or 'Unknown',
-                        'total_blunders': 0,
-                        'total_mistakes': 0,
-                        'results': {'1-0': 0, '0-1': 0, '1/2-1/2': 0}
-                    }
-                
-                opening_stats[eco]['count'] += 1
-                opening_stats[eco]['total_blunders'] += analysis.white_blunders + analysis.black_blunders
-                opening_stats[eco]['total_mistakes'] += analysis.white_mistakes + analysis.black_mistakes
-                
-                if analysis.result in opening_stats[eco]['results']:
-                    opening_stats[eco]['results'][analysis.result] += 1
+        df = pd.DataFrame(rows)
+        # sort=False keeps openings in order of first appearance
+        stats = df.groupby("opening_eco", sort=False).agg(
+            games=("opening_eco", "size"),
+            name=("opening_name", "first"),
+            total_blunders=("total_blunders", "sum"),
+            total_mistakes=("total_mistakes", "sum"),
+        )
+        results = pd.crosstab(df["opening_eco"], df["result"]).reindex(
+            index=stats.index, columns=list(RESULTS), fill_value=0
+        )
         
-        return opening_stats
+        return {
+            eco: {
+                'count': int(row.games),
+                'name': row.name,
+                'total_blunders': int(row.total_blunders),
+                'total_mistakes': int(row.total_mistakes),
+                'results': dict(zip(RESULTS, results.loc[eco].tolist()))
+            }
+            for eco, row in zip(stats.index, stats.itertuples(index=False))
+        }
     
     def get_weakness_patterns(self, analyses: List[GameAnalysis], 
                             target_player: str) -> Dict[str, Any]:
         """Identify weakness patterns for a specific player."""
-        weaknesses = {
-            'blunders_by_phase': {'opening': 0, 'middlegame': 0, 'endgame': 0},
-            'mistakes_by_phase': {'opening': 0, 'middlegame': 0, 'endgame': 0},
-            'average_centipawn_loss_by_phase': {'opening': [], 'middlegame': [], 'endgame': []},
-            'worst_moves': [],
-            'common_mistake_positions': []
-        }
+        blunders_by_phase = np.zeros(len(PHASES), dtype=np.int64)
+        mistakes_by_phase = np.zeros(len(PHASES), dtype=np.int64)
+        loss_sum_by_phase = np.zeros(len(PHASES), dtype=np.float64)
+        loss_count_by_phase = np.zeros(len(PHASES), dtype=np.int64)
+        blunder_changes = []
+        blunder_moves = []
+        flagged_moves = []
         
+        # Select the target player's games up front from the header names;
+        # only those reach the per-move work below
         target_player_lower = target_player.lower()
-        
+        player_games = []
         for analysis in analyses:
-            # Check if target player is in this game
-            is_white = (analysis.white_player and 
-                       target_player_lower in analysis.white_player.lower())
-            is_black = (analysis.black_player and 
-                       target_player_lower in analysis.black_player.lower())
+            is_white = bool(analysis.white_player and 
+                            target_player_lower in analysis.white_player.lower())
+            is_black = bool(analysis.black_player and 
+                            target_player_lower in analysis.black_player.lower())
+            if is_white or is_black:
+                player_games.append((analysis, is_white, is_black))
+        
+        for analysis, is_white, is_black in player_games:
+            # Moves by the target player: odd move numbers are White's
+            odd = analysis.move_number_arr % 2 == 1
+            target = (odd & is_white) | (~odd & is_black)
+            phases = analysis.phase_arr
             
-            if not (is_white or is_black):
-                continue
+            # Count blunders and mistakes by phase
+            blunders = target & analysis.is_blunder_arr
+            blunders_by_phase += np.bincount(phases[blunders], minlength=len(PHASES))
+            mistakes_by_phase += np.bincount(
+                phases[target & analysis.is_mistake_arr], minlength=len(PHASES)
+            )
             
-            # Analyze moves by the target player
-            for move_analysis in analysis.analyzed_moves:
-                # Determine if this is the target player's move
-                is_target_move = (
-                    (is_white and move_analysis.move_number % 2 == 1) or
-                    (is_black and move_analysis.move_number % 2 == 0)
-                )
-                
-                if not is_target_move:
-                    continue
-                
-                phase = move_analysis.phase
-                
-                # Count blunders and mistakes by phase
-                if move_analysis.is_blunder:
-                    weaknesses['blunders_by_phase'][phase] += 1
-                    weaknesses['worst_moves'].append({
-                        'move': move_analysis.move,
-                        'eval_change': move_analysis.eval_change,
-                        'phase': phase,
-                        'fen': move_analysis.fen_before
-                    })
-                
-                if move_analysis.is_mistake:
-                    weaknesses['mistakes_by_phase'][phase] += 1
-                
-                # Track centipawn loss by phase
-                if move_analysis.eval_change is not None:
-                    weaknesses['average_centipawn_loss_by_phase'][phase].append(
-                        move_analysis.eval_change
-                    )
-        
-        # Calculate averages
-        for phase in ['opening', 'middlegame', 'endgame']:
-            losses = weaknesses['average_centipawn_loss_by_phase'][phase]
-            if losses:
-                weaknesses['average_centipawn_loss_by_phase'][phase] = sum(losses) / len(losses)
-            else:
-                weaknesses['average_centipawn_loss_by_phase'][phase] = 0
+            # Track centipawn loss by phase
+            evaluated = target & ~np.isnan(analysis.eval_change_arr)
+            loss_sum_by_phase += np.bincount(
+                phases[evaluated],
+                weights=analysis.eval_change_arr[evaluated],
+                minlength=len(PHASES)
+            )
+            loss_count_by_phase += np.bincount(phases[evaluated], minlength=len(PHASES))
+            
+            for i in np.flatnonzero(blunders):
+                blunder_changes.append(analysis.eval_change_arr[i])
+                blunder_moves.append(analysis.analyzed_moves[i])
+            
+            flagged = target & (analysis.is_blunder_arr | analysis.is_mistake_arr)
+            flagged_moves.extend(
+                analysis.analyzed_moves[i] for i in np.flatnonzero(flagged)
+            )
         
-        # Sort worst moves by evaluation change
-        weaknesses['worst_moves'].sort(key=lambda x: x['eval_change'], reverse=True)
-        weaknesses['worst_moves'] = weaknesses['worst_moves'][:10]  # Top 10 worst moves
+        # Top 10 worst moves by evaluation change, selected in linear time.
+        # Ties at the cut-off go to the earliest moves, as a stable sort would.
+        changes = np.asarray(blunder_changes, dtype=np.float32)
+        worst = np.arange(changes.size)
+        if changes.size > 10:
+            cutoff = -np.partition(-changes, 9)[9]
+            above = np.flatnonzero(changes > cutoff)
+            tied = np.flatnonzero(changes == cutoff)[:10 - above.size]
+            worst = np.concatenate([above, tied])
+        worst = worst[np.lexsort((worst, -changes[worst]))]
         
-        return weaknesses
+        # Positions the player went wrong in more than once, matched across
+        # games by Zobrist hash
+        first_seen = {}
+        for ma in flagged_moves:
+            first_seen.setdefault(ma.zobrist, ma)
+        repeated = Counter(ma.zobrist for ma in flagged_moves).most_common(10)
+        
+        return {
+            'blunders_by_phase': dict(zip(PHASES, blunders_by_phase.tolist())),
+            'mistakes_by_phase': dict(zip(PHASES, mistakes_by_phase.tolist())),
+            'average_centipawn_loss_by_phase': {
+                phase: (float(loss_sum_by_phase[i] / loss_count_by_phase[i])
+                        if loss_count_by_phase[i] else 0)
+                for i, phase in enumerate(PHASES)
+            },
+            'worst_moves': [
+                {
+                    'move': blunder_moves[i].move,
+                    'eval_change': blunder_moves[i].eval_change,
+                    'phase': PHASES[blunder_moves[i].phase],
+                    'fen': blunder_moves[i].fen_before
+                }
+                for i in worst.tolist()
+            ],
+            'common_mistake_positions': [
+                {'fen': first_seen[key].fen_before, 'count': count}
+                for key, count in repeated
+                if count > 1
+            ]
+        }
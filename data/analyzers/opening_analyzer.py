@@ -2,11 +2,21 @@
 Opening preparation system for chess analysis.
 """
 
+import functools
+import io
+import itertools
 import json
-from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass, asdict
-from collections import defaultdict, Counter
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Any, Optional, Tuple
+from dataclasses import dataclass, asdict, field
+from collections import Counter
 import re
+import sys
+
+import numpy as np
+import pandas as pd
 
 try:
     import chess
@@ -16,8 +26,20 @@ try:
 except ImportError:
     CHESS_AVAILABLE = False
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    # Linear-time matching, immune to pathological backtracking
+    import re2 as re_engine
+except ImportError:
+    re_engine = re
 
-@dataclass
+
+@dataclass(slots=True)
 class OpeningVariation:
     """Represents a chess opening variation."""
     eco: str
@@ -32,7 +54,17 @@ class OpeningVariation:
     theoretical_assessment: str = ""  # "good for white", "equal", "good for black"
 
 
-@dataclass
+# Numeric view of a list of variations, for bulk filtering and sorting
+VARIATION_DTYPE = np.dtype([
+    ('eco', 'U3'),
+    ('frequency', 'i4'),
+    ('win_rate', 'f8'),
+    ('draw_rate', 'f8'),
+    ('loss_rate', 'f8'),
+])
+
+
+@dataclass(slots=True)
 class OpeningRepertoire:
     """Complete opening repertoire for a player."""
     player_name: str
@@ -51,6 +83,186 @@ class OpeningRepertoire:
             self.as_black_vs_d4 = []
         if self.as_black_vs_other is None:
             self.as_black_vs_other = []
+    
+    def to_array(self, category: str) -> np.ndarray:
+        """Return a category's variations as a VARIATION_DTYPE array, in
+        the same order."""
+        variations = getattr(self, category)
+        return np.fromiter(
+            ((v.eco, v.frequency, v.win_rate, v.draw_rate, v.loss_rate) for v in variations),
+            dtype=VARIATION_DTYPE,
+            count=len(variations)
+        )
+
+
+# Openings are identified from this many plies at the start of a game
+OPENING_PLIES = 10
+
+# Outcome for the player (0 win, 1 draw, 2 loss), indexed by [played White,
+# result code]. Result codes index DECISIVE_RESULTS; -1, the code for any
+# other result, picks the last column: a draw.
+DECISIVE_RESULTS = ('1-0', '0-1')
+_OUTCOME_TABLE = np.array([[2, 0, 1], [0, 2, 1]], dtype=np.intp)
+
+# Games are read from the input this many at a time
+GAME_BATCH_SIZE = 5000
+
+# Below this many PGN strings, parsing them in-process beats starting a
+# process pool
+PARALLEL_PGN_THRESHOLD = 500
+
+# Shared by every analyzer; started on first use, stopped by close()
+_encode_pool: Optional[ProcessPoolExecutor] = None
+_encode_pool_lock = threading.Lock()
+
+
+def _get_encode_pool() -> ProcessPoolExecutor:
+    """Return the shared PGN encoding pool, starting it on first use."""
+    global _encode_pool
+    # Analyses run in to_thread workers, so two may race to start it
+    with _encode_pool_lock:
+        if _encode_pool is None:
+            # Started from inside a running server that already has threads,
+            # which fork would copy mid-state
+            _encode_pool = ProcessPoolExecutor(
+                mp_context=multiprocessing.get_context("forkserver")
+            )
+        return _encode_pool
+
+
+def _shutdown_encode_pool() -> None:
+    """Stop the shared PGN encoding pool, if it was started."""
+    global _encode_pool
+    with _encode_pool_lock:
+        pool, _encode_pool = _encode_pool, None
+    if pool is not None:
+        pool.shutdown()
+
+# Repertoire categories, in the order of the bucket axis used while counting
+REPERTOIRE_CATEGORIES = ('as_white', 'as_black_vs_e4', 'as_black_vs_d4', 'as_black_vs_other')
+
+# Fallback PGN parsing, used when python-chess is not installed
+_COMMENT_RE = re_engine.compile(r'\{[^}]*\}')
+_VARIATION_RE = re_engine.compile(r'\([^)]*\)')
+_MOVE_RE = re_engine.compile(
+    r'\d+\.\s*([a-zA-Z][a-zA-Z0-9+#=\-]*)\s*([a-zA-Z][a-zA-Z0-9+#=\-]*)?'
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def _regex_extract(pgn_string: str) -> Tuple[str, ...]:
+    """Extract mainline moves from a PGN string with regexes."""
+    moves = []
+    # Remove comments and annotations
+    clean_pgn = _COMMENT_RE.sub('', pgn_string)
+    clean_pgn = _VARIATION_RE.sub('', clean_pgn)
+    
+    # Extract moves (basic pattern)
+    for match in _MOVE_RE.finditer(clean_pgn):
+        white_move, black_move = match.groups()
+        moves.append(white_move)
+        if black_move:
+            moves.append(black_move)
+    
+    return tuple(moves)
+
+
+def _encode_move(move: "chess.Move") -> int:
+    """Pack a move into 16 bits: from square, to square, promotion piece."""
+    return move.from_square | move.to_square << 6 | (move.promotion or 0) << 12
+
+
+def _decode_move(code: int) -> "chess.Move":
+    """Inverse of _encode_move."""
+    return chess.Move(code & 63, code >> 6 & 63, code >> 12 or None)
+
+
+def _encode_pgn(pgn_string: str) -> Tuple[int, ...]:
+    """Parse a PGN string and encode its opening plies.
+    
+    Module-level so process pool workers can run it.
+    """
+    try:
+        game = chess.pgn.read_game(io.StringIO(pgn_string))
+    except Exception:
+        return ()
+    if game is None:
+        return ()
+    return tuple(map(_encode_move, itertools.islice(game.mainline_moves(), OPENING_PLIES)))
+
+
+def iter_pgn_games(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield the games of a PGN file one at a time, as game dicts for
+    OpeningAnalyzer.analyze_player_openings."""
+    with open(path, encoding="utf-8-sig", errors="replace") as pgn_file:
+        while (game := chess.pgn.read_game(pgn_file)) is not None:
+            headers = game.headers
+            yield {
+                'white': headers.get("White", ""),
+                'black': headers.get("Black", ""),
+                'result': headers.get("Result", "*"),
+                'game': game,
+            }
+
+
+@functools.lru_cache(maxsize=65536)
+def _encode_san_line(moves: Tuple[str, ...]) -> Tuple:
+    """Encode a SAN move sequence from the starting position.
+    
+    Cached: replaying SAN is costly and games often open identically.
+    """
+    if not CHESS_AVAILABLE:
+        return moves
+    
+    board = chess.Board()
+    codes = []
+    for san in moves:
+        try:
+            codes.append(_encode_move(board.push_san(san)))
+        except ValueError:
+            break
+    return tuple(codes)
+
+
+def _tally_py(cell, outcome, game_idx, counts, first_game, last_game):
+    """Count each game's outcome in its cell and note each cell's first
+    and last game."""
+    np.add.at(counts, (cell, outcome), 1)
+    np.minimum.at(first_game, cell, game_idx)
+    np.maximum.at(last_game, cell, game_idx)
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _tally(cell, outcome, game_idx, counts, first_game, last_game):
+        """Compiled single-pass version of _tally_py."""
+        for i in range(cell.size):
+            c = cell[i]
+            g = game_idx[i]
+            counts[c, outcome[i]] += 1
+            if first_game[c] > g:
+                first_game[c] = g
+            if last_game[c] < g:
+                last_game[c] = g
+else:
+    _tally = _tally_py
+
+
+@dataclass(slots=True)
+class _OpeningTally:
+    """Running opening statistics, one cell per (bucket, ECO) pair."""
+    counts: np.ndarray  # (wins, draws, losses) per cell
+    first_game: np.ndarray  # Index of each cell's first game, orders ties
+    last_game: np.ndarray  # Index of each cell's last game
+    last_codes: Dict[int, Tuple] = field(default_factory=dict)  # Its moves
+    
+    @classmethod
+    def empty(cls, n_cells: int) -> "_OpeningTally":
+        return cls(
+            counts=np.zeros((n_cells, 3), dtype=np.int32),
+            first_game=np.full(n_cells, np.iinfo(np.intp).max, dtype=np.intp),
+            last_game=np.full(n_cells, -1, dtype=np.intp),
+        )
 
 
 class OpeningAnalyzer:
@@ -58,8 +270,27 @@ class OpeningAnalyzer:
     
     def __init__(self):
         """Initialize the opening analyzer."""
-        self.opening_database = self._load_opening_database()
+        # Interned so ECO codes, names and moves are shared by every result
+        # that refers to them; move lists become immutable, hashable tuples
+        self.opening_database = {
+            sys.intern(eco): {
+                **data,
+                "name": sys.intern(data["name"]),
+                "moves": tuple(map(sys.intern, data["moves"])),
+            }
+            for eco, data in self._load_opening_database().items()
+        }
         self.eco_patterns = self._build_eco_patterns()
+        self._prefix_map = self._build_prefix_map()
+        self._max_depth = max(map(len, self._prefix_map), default=0)
+        # Games repeat the same openings; cache on the encoded sequence
+        self._lookup = functools.lru_cache(maxsize=65536)(self._compile_matcher())
+        self._ecos = tuple(sorted(self.opening_database))
+        self._eco_to_idx = {eco: i for i, eco in enumerate(self._ecos)}
+    
+    def close(self):
+        """Stop the worker processes used to parse large PGN batches."""
+        _shutdown_encode_pool()
     
     def _load_opening_database(self) -> Dict[str, Any]:
         """Load opening database with ECO codes and names."""
@@ -141,197 +372,274 @@ class OpeningAnalyzer:
             patterns[eco] = moves_pattern
         return patterns
     
-    def identify_opening(self, moves: List[str]) -> Tuple[Optional[str], Optional[str]]:
-        """Identify opening from move sequence."""
-        if not moves:
-            return None, None
+    def _build_prefix_map(self) -> Dict[Tuple, Tuple[str, str]]:
+        """Map each opening's encoded move sequence to its (eco, name)."""
+        prefix_map = {}
+        for eco, data in self.opening_database.items():
+            # Keep the first entry if two openings share a move list
+            prefix_map.setdefault(self._encode_san(data["moves"]), (eco, data["name"]))
+        return prefix_map
+    
+    # Move sequences are handled as tuples of 16-bit move codes, and only
+    # turned back into SAN for output. Without python-chess, SAN strings
+    # are used as they are.
+    
+    def _encode_san(self, moves: List[str], limit: Optional[int] = None) -> Tuple:
+        """Encode up to ``limit`` SAN moves, stopping at the first illegal one."""
+        return _encode_san_line(tuple(moves[:limit]))
+    
+    def _encode_game(self, game: "chess.pgn.Game", limit: Optional[int] = None) -> Tuple:
+        """Encode up to ``limit`` mainline moves of a parsed game."""
+        return tuple(map(_encode_move, itertools.islice(game.mainline_moves(), limit)))
+    
+    def _encode_pgns(self, pgns: List[str]) -> List[Tuple[int, ...]]:
+        """Encode the opening plies of many PGN strings, in parallel if
+        there are enough of them."""
+        if len(pgns) < PARALLEL_PGN_THRESHOLD:
+            return list(map(_encode_pgn, pgns))
         
-        # Try to match against known patterns
-        best_match_eco = None
-        best_match_name = None
-        best_match_depth = 0
+        return list(_get_encode_pool().map(_encode_pgn, pgns, chunksize=64))
+    
+    def _decode(self, codes: Tuple) -> List[str]:
+        """Turn an encoded move sequence back into SAN."""
+        if not CHESS_AVAILABLE:
+            return list(codes)
         
-        for eco, data in self.opening_database.items():
-            opening_moves = data["moves"]
-            
-            # Check how many moves match from the beginning
-            match_depth = 0
-            for i, move in enumerate(opening_moves):
-                if i < len(moves) and moves[i] == move:
-                    match_depth += 1
-                else:
-                    break
-            
-            # Update best match if this is deeper
-            if match_depth > best_match_depth and match_depth == len(opening_moves):
-                best_match_eco = eco
-                best_match_name = data["name"]
-                best_match_depth = match_depth
+        board = chess.Board()
+        moves = []
+        for move in map(_decode_move, codes):
+            moves.append(board.san(move))
+            board.push(move)
+        return moves
+    
+    def _compile_matcher(self) -> Callable[[Tuple], Tuple[Optional[str], Optional[str]]]:
+        """Generate a function that finds the deepest opening whose move list
+        is a prefix of an encoded move sequence.
         
-        return best_match_eco, best_match_name
+        The opening lines are fixed once loaded, so the matcher is emitted as
+        a decision tree of nested comparisons on each ply, one branch per
+        known continuation, and compiled once. A sequence that leaves the
+        tree returns the last opening it passed through.
+        """
+        trie = {}
+        for line, match in self._prefix_map.items():
+            node = trie
+            for code in line:
+                node = node.setdefault(code, {})
+            node[None] = match
+        
+        # Matches are returned by name from the function's globals, so the
+        # interned ECO and name strings are shared rather than copied
+        namespace = {}
+        lines = ["def match(codes):", "    n = len(codes)"]
+        
+        def emit(node: Dict, depth: int, best: str, indent: str) -> None:
+            if None in node:
+                best = f"M{len(namespace)}"
+                namespace[best] = node[None]
+            children = [code for code in node if code is not None]
+            if children:
+                lines.append(f"{indent}if n > {depth}:")
+                lines.append(f"{indent}    c = codes[{depth}]")
+                for i, code in enumerate(children):
+                    keyword = "if" if i == 0 else "elif"
+                    lines.append(f"{indent}    {keyword} c == {code!r}:")
+                    emit(node[code], depth + 1, best, indent + "        ")
+            lines.append(f"{indent}return {best}")
+        
+        namespace["NO_MATCH"] = (None, None)
+        emit(trie, 0, "NO_MATCH", "    ")
+        exec(compile("\n".join(lines), "<opening matcher>", "exec"), namespace)
+        return namespace["match"]
+    
+    def identify_opening(self, moves: List[str]) -> Tuple[Optional[str], Optional[str]]:
+        """Identify opening from move sequence.
+        
+        Returns the deepest opening whose full move list is a prefix of
+        ``moves``.
+        """
+        return self._lookup(self._encode_san(moves, self._max_depth))
     
-    def analyze_player_openings(self, games_data: List[Dict[str, Any]], 
+    def analyze_player_openings(self, games_data: Iterable[Dict[str, Any]], 
                               target_player: str) -> OpeningRepertoire:
-        """Analyze a player's opening repertoire from their games."""
-        repertoire = OpeningRepertoire(player_name=target_player)
+        """Analyze a player's opening repertoire from their games.
         
-        # Track opening statistics
-        white_openings = defaultdict(lambda: {
-            'count': 0, 'wins': 0, 'draws': 0, 'losses': 0, 'moves': []
-        })
-        black_e4_openings = defaultdict(lambda: {
-            'count': 0, 'wins': 0, 'draws': 0, 'losses': 0, 'moves': []
-        })
-        black_d4_openings = defaultdict(lambda: {
-            'count': 0, 'wins': 0, 'draws': 0, 'losses': 0, 'moves': []
-        })
-        black_other_openings = defaultdict(lambda: {
-            'count': 0, 'wins': 0, 'draws': 0, 'losses': 0, 'moves': []
-        })
+        Each game dict may carry SAN ``moves``, an already parsed
+        ``chess.pgn.Game`` under ``game``, or a raw ``pgn`` string; the first
+        one present is used.
         
+        Games are consumed GAME_BATCH_SIZE at a time into running totals, so
+        ``games_data`` may be a generator of any length.
+        """
+        repertoire = OpeningRepertoire(player_name=target_player)
         target_player_lower = target_player.lower()
         
-        for game in games_data:
-            # Extract game info
-            white_player = game.get('white', '').lower()
-            black_player = game.get('black', '').lower()
-            result = game.get('result', '*')
+        n_ecos = len(self._ecos)
+        tally = _OpeningTally.empty(len(REPERTOIRE_CATEGORIES) * n_ecos)
+        games = iter(games_data)
+        offset = 0
+        while batch := list(itertools.islice(games, GAME_BATCH_SIZE)):
+            self._tally_games(batch, offset, target_player_lower, tally)
+            offset += len(batch)
+        
+        counts, first_game = tally.counts, tally.first_game
+        totals = counts.sum(axis=1)
+        
+        # Convert statistics to OpeningVariation objects
+        for b, category in enumerate(REPERTOIRE_CATEGORIES):
+            # Only include openings played at least twice
+            cells = b * n_ecos + np.flatnonzero(totals[b * n_ecos:(b + 1) * n_ecos] >= 2)
+            # Sort by frequency, then by first appearance
+            cells = cells[np.lexsort((first_game[cells], -totals[cells]))]
+            
+            variations = []
+            for c in cells.tolist():
+                eco = self._ecos[c % n_ecos]
+                total_games = int(totals[c])
+                wins, draws, losses = counts[c].tolist()
+                
+                variations.append(OpeningVariation(
+                    eco=eco,
+                    name=self.opening_database[eco]['name'],
+                    moves=self._decode(tally.last_codes[c]),
+                    fen="",  # Would need to calculate
+                    frequency=total_games,
+                    win_rate=wins / total_games,
+                    draw_rate=draws / total_games,
+                    loss_rate=losses / total_games
+                ))
+            setattr(repertoire, category, variations)
+        
+        return repertoire
+    
+    def _tally_games(self, games: List[Dict[str, Any]], offset: int,
+                     target_player_lower: str, tally: _OpeningTally) -> None:
+        """Add one batch of games, numbered from ``offset``, to ``tally``."""
+        # PGN strings are the costly input; a large batch of them is parsed
+        # across processes up front
+        pgn_codes = {}
+        if CHESS_AVAILABLE:
+            pending = [
+                i for i, game in enumerate(games)
+                if not game.get('moves') and game.get('game') is None and game.get('pgn')
+            ]
+            pgn_codes = dict(zip(
+                pending, self._encode_pgns([games[i]['pgn'] for i in pending])
+            ))
+        
+        # Move extraction is per game; everything after it is columnar.
+        # Games in the batch that open the same way share one tuple of move
+        # codes; the dict goes with the batch so memory stays bounded.
+        shared_codes: Dict[Tuple, Tuple] = {}
+        rows = []
+        for i, game in enumerate(games):
             moves = game.get('moves', [])
+            parsed_game = game.get('game')
             pgn = game.get('pgn', '')
             
-            if not moves and pgn:
-                moves = self._extract_moves_from_pgn(pgn)
-            
-            if len(moves) < 2:
-                continue
-            
-            # Determine if target player is white or black
-            is_white = target_player_lower in white_player
-            is_black = target_player_lower in black_player
-            
-            if not (is_white or is_black):
-                continue
+            codes = ()
+            if moves:
+                codes = self._encode_san(moves, OPENING_PLIES)
+            elif parsed_game is not None:
+                codes = self._encode_game(parsed_game, OPENING_PLIES)
+            elif pgn and CHESS_AVAILABLE:
+                codes = pgn_codes[i]
+            elif pgn:
+                codes = self._encode_san(self._extract_moves_from_pgn(pgn, OPENING_PLIES))
             
-            # Identify the opening
-            eco, opening_name = self.identify_opening(moves[:10])  # Use first 10 moves
-            if not eco:
+            if len(codes) < 2:
                 continue
+            codes = shared_codes.setdefault(codes, codes)
             
-            # Determine result from target player's perspective
-            if is_white:
-                if result == '1-0':
-                    player_result = 'win'
-                elif result == '0-1':
-                    player_result = 'loss'
-                else:
-                    player_result = 'draw'
-            else:
-                if result == '0-1':
-                    player_result = 'win'
-                elif result == '1-0':
-                    player_result = 'loss'
-                else:
-                    player_result = 'draw'
-            
-            # Categorize the opening
-            if is_white:
-                stats = white_openings[eco]
-                stats['moves'] = moves[:10]
-                stats['count'] += 1
-                if player_result == 'win':
-                    stats['wins'] += 1
-                elif player_result == 'loss':
-                    stats['losses'] += 1
-                else:
-                    stats['draws'] += 1
-            
-            else:  # is_black
-                first_move = moves[0] if moves else ""
-                
-                if first_move == 'e4':
-                    stats = black_e4_openings[eco]
-                elif first_move == 'd4':
-                    stats = black_d4_openings[eco]
-                else:
-                    stats = black_other_openings[eco]
-                
-                stats['moves'] = moves[:10]
-                stats['count'] += 1
-                if player_result == 'win':
-                    stats['wins'] += 1
-                elif player_result == 'loss':
-                    stats['losses'] += 1
-                else:
-                    stats['draws'] += 1
+            rows.append((
+                offset + i,
+                game.get('white') or '',
+                game.get('black') or '',
+                game.get('result', '*'),
+                codes
+            ))
         
-        # Convert statistics to OpeningVariation objects
-        def create_variations(opening_stats: Dict) -> List[OpeningVariation]:
-            variations = []
-            for eco, stats in opening_stats.items():
-                if stats['count'] >= 2:  # Only include if played at least twice
-                    total_games = stats['count']
-                    win_rate = stats['wins'] / total_games
-                    draw_rate = stats['draws'] / total_games
-                    loss_rate = stats['losses'] / total_games
-                    
-                    opening_name = self.opening_database.get(eco, {}).get('name', 'Unknown Opening')
-                    
-                    variation = OpeningVariation(
-                        eco=eco,
-                        name=opening_name,
-                        moves=stats['moves'],
-                        fen="",  # Would need to calculate
-                        frequency=total_games,
-                        win_rate=win_rate,
-                        draw_rate=draw_rate,
-                        loss_rate=loss_rate
-                    )
-                    variations.append(variation)
-            
-            # Sort by frequency
-            variations.sort(key=lambda x: x.frequency, reverse=True)
-            return variations
+        if not rows:
+            return
         
-        repertoire.as_white = create_variations(white_openings)
-        repertoire.as_black_vs_e4 = create_variations(black_e4_openings)
-        repertoire.as_black_vs_d4 = create_variations(black_d4_openings)
-        repertoire.as_black_vs_other = create_variations(black_other_openings)
+        df = pd.DataFrame(rows, columns=['game', 'white', 'black', 'result', 'moves'])
+        # A player's games repeat the same few names; as categoricals, the
+        # string operations below run once per distinct name
+        df = df.astype({'white': 'category', 'black': 'category'})
         
-        return repertoire
+        # Determine if target player is white or black
+        is_white = df['white'].str.lower().str.contains(target_player_lower, regex=False)
+        is_black = df['black'].str.lower().str.contains(target_player_lower, regex=False)
+        df = df[is_white | is_black]
+        is_white = is_white[df.index].to_numpy()
+        
+        # Identify the opening
+        df = df.assign(eco=[self._lookup(moves)[0] for moves in df['moves']])
+        keep = df['eco'].notna().to_numpy()
+        df, is_white = df[keep], is_white[keep]
+        if df.empty:
+            return
+        
+        # Result from the target player's perspective: 0 win, 1 draw, 2 loss
+        result_code = pd.Categorical(df['result'], categories=DECISIVE_RESULTS).codes
+        outcome = _OUTCOME_TABLE[is_white.astype(np.intp), result_code]
+        
+        # Categorize the opening: as White, or as Black by White's first move
+        first_move = df['moves'].str[0]
+        e4, d4 = self._encode_san(['e4']) + self._encode_san(['d4'])
+        bucket = np.select(
+            [is_white, first_move == e4, first_move == d4], [0, 1, 2], default=3
+        )
+        
+        eco_idx = np.fromiter(
+            (self._eco_to_idx[eco] for eco in df['eco']), dtype=np.intp, count=len(df)
+        )
+        cell = bucket * len(self._ecos) + eco_idx
+        game_idx = df['game'].to_numpy(dtype=np.intp)
+        _tally(
+            cell.astype(np.intp), outcome.astype(np.intp), game_idx,
+            tally.counts, tally.first_game, tally.last_game
+        )
+        
+        # Cells whose last game is in this batch take its moves
+        codes_by_game = dict(zip(game_idx.tolist(), df['moves'].tolist()))
+        for c in np.flatnonzero(tally.last_game >= offset).tolist():
+            tally.last_codes[c] = codes_by_game[tally.last_game[c]]
     
-    def _extract_moves_from_pgn(self, pgn_string: str) -> List[str]:
-        """Extract moves from PGN string."""
+    def _extract_moves_from_pgn(self, pgn_string: str,
+                                limit: Optional[int] = None) -> List[str]:
+        """Extract moves from PGN string, up to ``limit`` plies."""
         if not CHESS_AVAILABLE:
-            # Fallback: basic regex parsing
-            moves = []
-            # Remove comments and annotations
-            clean_pgn = re.sub(r'\{[^}]*\}', '', pgn_string)
-            clean_pgn = re.sub(r'\([^)]*\)', '', clean_pgn)
-            
-            # Extract moves (basic pattern)
-            move_pattern = r'\d+\.\s*([a-zA-Z][a-zA-Z0-9+#=\-]*)\s*([a-zA-Z][a-zA-Z0-9+#=\-]*)?'
-            matches = re.findall(move_pattern, clean_pgn)
-            
-            for match in matches:
-                moves.append(match[0])
-                if match[1]:
-                    moves.append(match[1])
-            
-            return moves
+            # Fallback: basic regex parsing, cached per PGN string
+            return list(_regex_extract(pgn_string)[:limit])
+        
+        game = self._read_pgn(pgn_string)
+        if game:
+            return self._moves_from_game(game, limit)
         
+        return []
+    
+    def _read_pgn(self, pgn_string: str) -> Optional["chess.pgn.Game"]:
+        """Parse the first game of a PGN string, or None if it can't be read."""
         try:
-            game = chess.pgn.read_game(chess.io.StringIO(pgn_string))
-            if game:
-                board = game.board()
-                moves = []
-                for move in game.mainline_moves():
-                    moves.append(board.san(move))
-                    board.push(move)
-                return moves
+            return chess.pgn.read_game(io.StringIO(pgn_string))
         except:
-            pass
+            return None
+    
+    def _moves_from_game(self, game: "chess.pgn.Game",
+                         limit: Optional[int] = None) -> List[str]:
+        """Get the mainline moves of a parsed game in SAN, up to ``limit``
+        plies.
         
-        return []
+        SAN generation is the expensive part, so moves past the limit are
+        never converted.
+        """
+        board = game.board()
+        moves = []
+        for move in itertools.islice(game.mainline_moves(), limit):
+            moves.append(board.san(move))
+            board.push(move)
+        return moves
     
     def compare_repertoires(self, player1_repertoire: OpeningRepertoire, 
                           player2_repertoire: OpeningRepertoire) -> Dict[str, Any]:
@@ -357,20 +665,18 @@ class OpeningAnalyzer:
             }
         }
         
-        categories = ['as_white', 'as_black_vs_e4', 'as_black_vs_d4', 'as_black_vs_other']
-        
-        for category in categories:
-            p1_openings = set(v.eco for v in getattr(player1_repertoire, category))
-            p2_openings = set(v.eco for v in getattr(player2_repertoire, category))
+        for category in REPERTOIRE_CATEGORIES:
+            # ECO -> opening object for each side, built once per category;
+            # the set operations run on the key views
+            p1_openings_dict = {v.eco: v for v in getattr(player1_repertoire, category)}
+            p2_openings_dict = {v.eco: v for v in getattr(player2_repertoire, category)}
+            p1_openings = p1_openings_dict.keys()
+            p2_openings = p2_openings_dict.keys()
             
-            common = p1_openings.intersection(p2_openings)
+            common = p1_openings & p2_openings
             unique_p1 = p1_openings - p2_openings
             unique_p2 = p2_openings - p1_openings
             
-            # Get the actual opening objects
-            p1_openings_dict = {v.eco: v for v in getattr(player1_repertoire, category)}
-            p2_openings_dict = {v.eco: v for v in getattr(player2_repertoire, category)}
-            
             comparison['common_openings'][category] = [
                 {'player1': p1_openings_dict[eco], 'player2': p2_openings_dict[eco]}
                 for eco in common
@@ -395,36 +701,42 @@ class OpeningAnalyzer:
         }
         
         # Analyze as White
-        for opening in target_repertoire.as_white:
-            if opening.win_rate > 0.6 and opening.frequency >= 5:
-                suggestions['strengths'].append({
-                    'type': 'white_opening',
-                    'opening': opening.name,
-                    'eco': opening.eco,
-                    'reason': f"Strong performance: {opening.win_rate:.1%} win rate in {opening.frequency} games"
-                })
-            elif opening.win_rate < 0.4 and opening.frequency >= 3:
-                suggestions['weaknesses'].append({
-                    'type': 'white_opening',
-                    'opening': opening.name,
-                    'eco': opening.eco,
-                    'reason': f"Poor performance: {opening.win_rate:.1%} win rate in {opening.frequency} games"
-                })
-        
-        # Analyze as Black
-        all_black_openings = (target_repertoire.as_black_vs_e4 + 
-                             target_repertoire.as_black_vs_d4 + 
-                             target_repertoire.as_black_vs_other)
+        white = target_repertoire.as_white
+        stats = target_repertoire.to_array('as_white')
+        win_rates, frequencies = stats['win_rate'], stats['frequency']
+        for i in np.flatnonzero((win_rates > 0.6) & (frequencies >= 5)):
+            opening = white[i]
+            suggestions['strengths'].append({
+                'type': 'white_opening',
+                'opening': opening.name,
+                'eco': opening.eco,
+                'reason': f"Strong performance: {opening.win_rate:.1%} win rate in {opening.frequency} games"
+            })
+        for i in np.flatnonzero((win_rates < 0.4) & (frequencies >= 3)):
+            opening = white[i]
+            suggestions['weaknesses'].append({
+                'type': 'white_opening',
+                'opening': opening.name,
+                'eco': opening.eco,
+                'reason': f"Poor performance: {opening.win_rate:.1%} win rate in {opening.frequency} games"
+            })
         
-        for opening in all_black_openings:
-            if opening.win_rate > 0.5 and opening.frequency >= 5:
+        # Analyze as Black, one list at a time; each list's suggestions come
+        # out in order, as they would from the lists joined together
+        for category in REPERTOIRE_CATEGORIES[1:]:
+            black = getattr(target_repertoire, category)
+            stats = target_repertoire.to_array(category)
+            win_rates, frequencies = stats['win_rate'], stats['frequency']
+            for i in np.flatnonzero((win_rates > 0.5) & (frequencies >= 5)):
+                opening = black[i]
                 suggestions['strengths'].append({
                     'type': 'black_defense',
                     'opening': opening.name,
                     'eco': opening.eco,
                     'reason': f"Solid defense: {opening.win_rate:.1%} score in {opening.frequency} games"
                 })
-            elif opening.win_rate < 0.35 and opening.frequency >= 3:
+            for i in np.flatnonzero((win_rates < 0.35) & (frequencies >= 3)):
+                opening = black[i]
                 suggestions['weaknesses'].append({
                     'type': 'black_defense',
                     'opening': opening.name,
@@ -3,20 +3,221 @@ Main fetcher coordinator that manages all chess platforms.
 """
 
 import asyncio
-from typing import List, Dict, Any, Optional
+import io
+import logging
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Dict, Any, Optional
 from datetime import datetime
 
-from .base import BaseFetcher, FetchRequest, FetchResult, Platform, FetcherRegistry
+import aiohttp
+
+from .base import (
+    BaseFetcher,
+    FetchRequest,
+    FetchResult,
+    Platform,
+    FetcherRegistry,
+    create_session,
+)
 from .chess_com import ChessComFetcher
 from .lichess import LichessFetcher
 from .fide import FideFetcher
 
-# Import Game model
-import sys
-import os
+from shared.models import Game, GameMetadata
+
+logger = logging.getLogger(__name__)
+
+
+# Per-game PGN lists at least this long are parsed in a process pool,
+# PARSE_CHUNK_SIZE games per task
+PARALLEL_PARSE_THRESHOLD = 500
+PARSE_CHUNK_SIZE = 100
+
+_parse_pool: Optional[ProcessPoolExecutor] = None
+
+# Boundary between games in a multi-game PGN: a blank line, then a tag pair
+_PGN_SPLIT_RE = re.compile(r"\n\s*\n(?=\[)")
+
+# PGN tag pair, e.g. [White "Carlsen, Magnus"]
+_HEADER_RE = re.compile(r'\[(\w+)\s+"([^"]*)"\]')
+
+# Seven Tag Roster placeholders, as filled in by chess.pgn for missing tags
+_ROSTER_DEFAULTS = {
+    "Event": "?",
+    "Site": "?",
+    "Date": "????.??.??",
+    "Round": "?",
+    "White": "?",
+    "Black": "?",
+    "Result": "*",
+}
+
+
+def _error_result(platform: Platform, error: str) -> FetchResult:
+    """Failed FetchResult carrying a single error."""
+    return FetchResult(
+        success=False,
+        games_count=0,
+        pgn_text="",
+        metadata={},
+        errors=[error],
+        source_info={"platform": platform},
+    )
+
+
+def _get_parse_pool() -> ProcessPoolExecutor:
+    """Return the shared PGN parsing pool, starting it on first use."""
+    global _parse_pool
+    if _parse_pool is None:
+        # The pool starts inside a running server that already has threads
+        # (log listener, to_thread workers), which fork would copy mid-state
+        _parse_pool = ProcessPoolExecutor(
+            max_workers=os.cpu_count(),
+            mp_context=multiprocessing.get_context("forkserver"),
+        )
+    return _parse_pool
+
+
+async def _shutdown_parse_pool() -> None:
+    """Stop the shared PGN parsing pool, if it was started."""
+    global _parse_pool
+    pool, _parse_pool = _parse_pool, None
+    if pool is not None:
+        await asyncio.to_thread(pool.shutdown)
+
+
+def _game_builder(moves_limit: Optional[int] = None):
+    """Visitor class for chess.pgn.read_game.
+
+    With ``moves_limit`` set, SAN past that many plies is skipped rather than
+    parsed, so the games are truncated.
+    """
+    import chess.pgn
+
+    if moves_limit is None:
+        return chess.pgn.GameBuilder
+
+    class TruncatingGameBuilder(chess.pgn.GameBuilder):
+        def begin_parse_san(self, board, san):
+            if board.ply() >= moves_limit:
+                return chess.pgn.SKIP
+            return None
+
+    return TruncatingGameBuilder
+
+
+def _split_pgn(pgn_text: str) -> List[str]:
+    """Split a multi-game PGN text into one string per game."""
+    return [pgn for pgn in _PGN_SPLIT_RE.split(pgn_text) if pgn.strip()]
+
+
+def _result_pgns(result: FetchResult) -> List[str]:
+    """Per-game PGNs of a fetch result, splitting its text if need be."""
+    return result.pgn_games or _split_pgn(result.pgn_text)
+
+
+def _iter_games(pgns: List[str], moves_limit: Optional[int] = None) -> Iterator[Any]:
+    """Parse per-game PGNs with python-chess."""
+    import chess.pgn
+
+    visitor = _game_builder(moves_limit)
+    for pgn in pgns:
+        game = chess.pgn.read_game(io.StringIO(pgn), Visitor=visitor)
+        if game is not None:
+            yield game
+
+
+def _headers_from_pgn(pgn: str) -> Dict[str, str]:
+    """Read the tag pairs of a single-game PGN without parsing its moves."""
+    headers = dict(_ROSTER_DEFAULTS)
+    headers.update(_HEADER_RE.findall(pgn))
+    return headers
+
+
+def _parse_elo(value: str) -> Optional[int]:
+    """Rating from an Elo tag; None for placeholders such as "?" or "-"."""
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+def _metadata_from_headers(headers: Any, platform: str) -> GameMetadata:
+    """Build GameMetadata from PGN tag pairs."""
+    from shared.models import Player, GameResult
+
+    return GameMetadata(
+        event=headers.get("Event"),
+        site=headers.get("Site"),
+        date=headers.get("Date"),
+        round=headers.get("Round"),
+        white=Player(
+            name=headers.get("White", "Unknown"),
+            rating=_parse_elo(headers.get("WhiteElo", "0")),
+            platform=platform,
+        ),
+        black=Player(
+            name=headers.get("Black", "Unknown"),
+            rating=_parse_elo(headers.get("BlackElo", "0")),
+            platform=platform,
+        ),
+        result=GameResult(headers.get("Result", "*")),
+        eco=headers.get("ECO"),
+        time_control=None,  # Skip time control parsing for now
+    )
+
+
+def _to_game_model(game: Any, platform: str) -> Game:
+    """Convert a python-chess game into a Game."""
+    from shared.models import Move
+
+    headers = game.headers
+    metadata = _metadata_from_headers(headers, platform)
+
+    # Extract moves
+    moves = []
+    board = game.board()
+    move_number = 1
+    white_move = None
+
+    for move in game.mainline_moves():
+        white_to_move = board.turn
+        san_move = board.san_and_push(move)
+
+        if white_to_move:
+            white_move = san_move
+        else:  # Black's turn, so white move is stored, now add black
+            moves.append(
+                Move(
+                    move_number=move_number,
+                    white_move=white_move,
+                    black_move=san_move,
+                )
+            )
+            move_number += 1
+            white_move = None
+
+    # Add final white move if exists
+    if white_move:
+        moves.append(Move(move_number=move_number, white_move=white_move))
+
+    # Create Game object
+    return Game(
+        id=headers.get("Site", ""),
+        metadata=metadata,
+        moves=moves,
+        pgn=str(game),
+    )
 
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from shared.models import Game
+
+def _parse_pgn_chunk(
+    pgns: List[str], platform: str, moves_limit: Optional[int] = None
+) -> List[Game]:
+    """Parse a chunk of per-game PGNs into Games (process pool task)."""
+    return [_to_game_model(game, platform) for game in _iter_games(pgns, moves_limit)]
 
 
 class ChessDataFetcher:
@@ -24,6 +225,7 @@ class ChessDataFetcher:
 
     def __init__(self):
         self.registry = FetcherRegistry()
+        self._session: Optional[aiohttp.ClientSession] = None
         self._setup_fetchers()
 
     def _setup_fetchers(self):
@@ -46,20 +248,23 @@ class ChessDataFetcher:
         """Get list of all supported platforms."""
         return self.registry.get_supported_platforms()
 
+    def _ensure_session(self):
+        """Open the HTTP session shared by every fetcher, on first use."""
+        if self._session is None or self._session.closed:
+            self._session = create_session()
+            for fetcher in self.registry._fetchers.values():
+                fetcher.session = self._session
+
     async def fetch_single_platform(self, request: FetchRequest) -> FetchResult:
         """Fetch games from a single platform."""
         fetcher = self.registry.get_fetcher(request.platform)
 
         if not fetcher:
-            return FetchResult(
-                success=False,
-                games_count=0,
-                pgn_content="",
-                metadata={},
-                errors=[f"Platform {request.platform} not supported"],
-                source_info={"platform": request.platform},
+            return _error_result(
+                request.platform, f"Platform {request.platform} not supported"
             )
 
+        self._ensure_session()
         async with fetcher:
             return await fetcher.fetch_games(request)
 
@@ -93,45 +298,63 @@ class ChessDataFetcher:
         results = await self.fetch_multiple_platforms(requests)
 
         # Organize results by platform
-        platform_results = {}
-        for i, (request, result) in enumerate(zip(requests, results)):
-            if isinstance(result, Exception):
-                # Handle exceptions
-                platform_results[request.platform] = FetchResult(
-                    success=False,
-                    games_count=0,
-                    pgn_content="",
-                    metadata={},
-                    errors=[f"Exception: {result}"],
-                    source_info={"platform": request.platform},
-                )
-            else:
-                platform_results[request.platform] = result
-
-        return platform_results
+        return {
+            platform: (
+                _error_result(platform, f"Exception: {result}")
+                if isinstance(result, Exception)
+                else result
+            )
+            for platform, result in zip(platforms, results)
+        }
 
     async def get_player_info_all_platforms(
         self, username: str
     ) -> Dict[Platform, Dict[str, Any]]:
-        """Get player information from all platforms."""
-        results = {}
+        """Get player information from all platforms, querying them
+        concurrently. A fetcher registered for several platforms is asked
+        once."""
+        self._ensure_session()
 
+        platforms_by_fetcher: Dict[int, List[Platform]] = {}
+        fetchers = {}
         for platform in self.get_supported_platforms():
             fetcher = self.registry.get_fetcher(platform)
             if fetcher:
-                async with fetcher:
-                    info = await fetcher.get_player_info(username)
-                    if info:
-                        results[platform] = info
+                platforms_by_fetcher.setdefault(id(fetcher), []).append(platform)
+                fetchers[id(fetcher)] = fetcher
+
+        async def player_info(fetcher: BaseFetcher) -> Optional[Dict[str, Any]]:
+            async with fetcher:
+                return await fetcher.get_player_info(username)
+
+        infos = await asyncio.gather(
+            *(player_info(fetcher) for fetcher in fetchers.values()),
+            return_exceptions=True,
+        )
+
+        results = {}
+        for key, info in zip(fetchers, infos):
+            if info and not isinstance(info, Exception):
+                for platform in platforms_by_fetcher[key]:
+                    results[platform] = info
 
         return results
 
     async def fetch_player_games(
-        self, username: str, platform: str, limit: int = 100
+        self,
+        username: str,
+        platform: str,
+        limit: int = 100,
+        concurrency: int = 1,
+        moves_limit: Optional[int] = None,
+        headers_only: bool = False,
     ) -> List[Game]:
-        """Fetch player games and convert to Game objects."""
-        from shared.models import Game, GameMetadata, Player, GameResult, Move
+        """Fetch player games and convert to Game objects.
 
+        ``moves_limit`` caps the plies parsed per game; 0 keeps only the
+        headers. ``headers_only`` reads just the tag pairs with a regex and
+        returns games without moves.
+        """
         # Convert string platform to Platform enum
         platform_map = {
             "chess.com": Platform.CHESS_COM,
@@ -143,128 +366,131 @@ class ChessDataFetcher:
 
         # Create fetch request
         request = FetchRequest(
-            username=username, platform=platform_enum, max_games=limit
+            username=username,
+            platform=platform_enum,
+            max_games=limit,
+            concurrency=concurrency,
         )
 
         # Fetch games
         result = await self.fetch_single_platform(request)
 
-        if not result.success or not result.pgn_content:
+        if not result.success or not (result.pgn_games or result.pgn_text):
             return []
 
+        # Platforms that stream one PGN text are split into games up front
+        pgns = _result_pgns(result)
+
+        if headers_only:
+            return self._games_from_headers(pgns, platform, limit)
+
         # Parse PGN content into Game objects
         games = []
         try:
-            import chess.pgn
-            import io
-
-            # Split PGN content by games
-            pgn_io = io.StringIO(result.pgn_content)
-
-            while True:
-                game = chess.pgn.read_game(pgn_io)
-                if game is None:
-                    break
-
-                # Extract game information
-                headers = game.headers
-
-                # Create metadata
-                metadata = GameMetadata(
-                    event=headers.get("Event"),
-                    site=headers.get("Site"),
-                    date=headers.get("Date"),
-                    round=headers.get("Round"),
-                    white=Player(
-                        name=headers.get("White", "Unknown"),
-                        rating=(
-                            int(headers.get("WhiteElo", "0"))
-                            if headers.get("WhiteElo", "0").isdigit()
-                            else None
-                        ),
-                        platform=platform,
-                    ),
-                    black=Player(
-                        name=headers.get("Black", "Unknown"),
-                        rating=(
-                            int(headers.get("BlackElo", "0"))
-                            if headers.get("BlackElo", "0").isdigit()
-                            else None
-                        ),
-                        platform=platform,
-                    ),
-                    result=GameResult(headers.get("Result", "*")),
-                    eco=headers.get("ECO"),
-                    time_control=None,  # Skip time control parsing for now
-                )
-
-                # Extract moves
-                moves = []
-                board = game.board()
-                move_number = 1
-                white_move = None
-
-                for move in game.mainline_moves():
-                    san_move = board.san(move)
-
-                    if board.turn:  # White's turn before move
-                        white_move = san_move
-                    else:  # Black's turn, so white move is stored, now add black
-                        moves.append(
-                            Move(
-                                move_number=move_number,
-                                white_move=white_move,
-                                black_move=san_move,
-                            )
+            # Only the games that will be kept count towards the threshold
+            wanted = pgns[:limit]
+            if len(wanted) >= PARALLEL_PARSE_THRESHOLD:
+                pgns = wanted
+                loop = asyncio.get_running_loop()
+                pool = _get_parse_pool()
+                chunks = await asyncio.gather(
+                    *(
+                        loop.run_in_executor(
+                            pool,
+                            _parse_pgn_chunk,
+                            pgns[start : start + PARSE_CHUNK_SIZE],
+                            platform,
+                            moves_limit,
                         )
-                        move_number += 1
-                        white_move = None
-
-                    board.push(move)
-
-                # Add final white move if exists
-                if white_move:
-                    moves.append(Move(move_number=move_number, white_move=white_move))
-
-                # Create Game object
-                chess_game = Game(
-                    id=headers.get("Site", ""),
-                    metadata=metadata,
-                    moves=moves,
-                    pgn=str(game),
+                        for start in range(0, len(pgns), PARSE_CHUNK_SIZE)
+                    )
                 )
+                games = [game for chunk in chunks for game in chunk]
+            else:
+                for game in _iter_games(pgns, moves_limit):
+                    games.append(_to_game_model(game, platform))
 
-                games.append(chess_game)
-
-                if len(games) >= limit:
-                    break
+                    if len(games) >= limit:
+                        break
 
         except ImportError:
             # Fallback if chess library is not available
-            print("python-chess not available, using basic PGN parsing")
+            logger.warning("python-chess not available, using basic PGN parsing")
             # Basic parsing would go here
             pass
         except Exception as e:
-            print(f"Error parsing PGN: {e}")
-            import traceback
+            # Tracebacks only when debugging; they are costly on bulk fetches
+            logger.warning(
+                "Error parsing PGN: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG)
+            )
 
-            traceback.print_exc()
+        return games
+
+    def _games_from_headers(
+        self, pgns: List[str], platform: str, limit: int
+    ) -> List[Game]:
+        """Build move-less Games from the tag pairs of per-game PGNs."""
+        games = []
+        try:
+            for pgn in pgns[:limit]:
+                headers = _headers_from_pgn(pgn)
+                games.append(
+                    Game(
+                        id=headers.get("Site", ""),
+                        metadata=_metadata_from_headers(headers, platform),
+                        moves=[],
+                        pgn=pgn,
+                    )
+                )
+        except Exception as e:
+            logger.warning("Error parsing PGN headers: %s", e)
 
         return games
 
+    async def fetch_player_games_concurrent(
+        self,
+        username: str,
+        platform: str,
+        limit: int = 100,
+        concurrency: int = 5,
+        moves_limit: Optional[int] = None,
+    ) -> List[Game]:
+        """Fetch player games, requesting up to ``concurrency`` pages at once.
+
+        Only platforms that paginate (Chess.com monthly archives) benefit;
+        requests still go through the fetcher's rate limiter.
+        """
+        return await self.fetch_player_games(
+            username,
+            platform,
+            limit=limit,
+            concurrency=concurrency,
+            moves_limit=moves_limit,
+        )
+
     async def close(self):
-        """Close all active connections."""
-        # Close any active fetcher connections
-        for fetcher in self.registry._fetchers.values():
+        """Close the shared HTTP session, any fetcher-held connections and
+        the PGN parsing pool."""
+        for fetcher in set(self.registry._fetchers.values()):
             if hasattr(fetcher, "close"):
-                try:
-                    await fetcher.close()
-                except:
-                    pass
+                await fetcher.close()
+
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+            for fetcher in self.registry._fetchers.values():
+                fetcher.session = None
+
+        await _shutdown_parse_pool()
 
     def combine_pgn_results(self, results: Dict[Platform, FetchResult]) -> FetchResult:
-        """Combine results from multiple platforms into a single result."""
+        """Combine results from multiple platforms into a single result.
+
+        When every platform returned per-game PGNs the lists are concatenated;
+        otherwise the games are combined as text, one section per platform.
+        """
         all_pgns = []
+        all_games = []
         total_games = 0
         all_errors = []
         all_metadata = {}
@@ -272,10 +498,8 @@ class ChessDataFetcher:
         successful_platforms = []
 
         for platform, result in results.items():
-            if result.success and result.pgn_content:
-                all_pgns.append(
-                    f"# Games from {platform.value}\n\n{result.pgn_content}"
-                )
+            if result.success and (result.pgn_games or result.pgn_text):
+                all_games.append(result.pgn_games)
                 total_games += result.games_count
                 successful_platforms.append(platform)
                 all_metadata[f"{platform.value}_metadata"] = result.metadata
@@ -285,12 +509,23 @@ class ChessDataFetcher:
                     [f"{platform.value}: {error}" for error in result.errors]
                 )
 
-        combined_pgn = "\n\n".join(all_pgns)
+        if all(all_games):
+            pgn_games = [pgn for games in all_games for pgn in games]
+            combined_pgn = ""
+        else:
+            # Section headers and every game's PGN go into one flat list, so
+            # the combined text is built by a single join
+            pgn_games = []
+            for platform in successful_platforms:
+                result = results[platform]
+                all_pgns.append(f"# Games from {platform.value}")
+                all_pgns.extend(result.pgn_games or (result.pgn_text,))
+            combined_pgn = "\n\n".join(all_pgns)
 
         return FetchResult(
             success=len(successful_platforms) > 0,
             games_count=total_games,
-            pgn_content=combined_pgn,
+            pgn_text=combined_pgn,
             metadata={
                 "platforms": [p.value for p in successful_platforms],
                 "platform_details": all_metadata,
@@ -302,6 +537,7 @@ class ChessDataFetcher:
                 "platforms": successful_platforms,
                 "fetch_date": datetime.now().isoformat(),
             },
+            pgn_games=pgn_games,
         )
 
 
@@ -310,24 +546,36 @@ async def fetch_chess_com_games(username: str, **kwargs) -> FetchResult:
     """Convenience function to fetch Chess.com games."""
     fetcher = ChessDataFetcher()
     request = FetchRequest(username=username, platform=Platform.CHESS_COM, **kwargs)
-    return await fetcher.fetch_single_platform(request)
+    try:
+        return await fetcher.fetch_single_platform(request)
+    finally:
+        await fetcher.close()
 
 
 async def fetch_lichess_games(username: str, **kwargs) -> FetchResult:
     """Convenience function to fetch Lichess games."""
     fetcher = ChessDataFetcher()
     request = FetchRequest(username=username, platform=Platform.LICHESS, **kwargs)
-    return await fetcher.fetch_single_platform(request)
+    try:
+        return await fetcher.fetch_single_platform(request)
+    finally:
+        await fetcher.close()
 
 
 async def fetch_fide_games(username: str, **kwargs) -> FetchResult:
     """Convenience function to fetch FIDE/OTB games."""
     fetcher = ChessDataFetcher()
     request = FetchRequest(username=username, platform=Platform.FIDE, **kwargs)
-    return await fetcher.fetch_single_platform(request)
+    try:
+        return await fetcher.fetch_single_platform(request)
+    finally:
+        await fetcher.close()
 
 
 async def fetch_all_games(username: str, **kwargs) -> Dict[Platform, FetchResult]:
     """Convenience function to fetch games from all platforms."""
     fetcher = ChessDataFetcher()
-    return await fetcher.fetch_all_platforms(username, **kwargs)
+    try:
+        return await fetcher.fetch_all_platforms(username, **kwargs)
+    finally:
+        await fetcher.close()
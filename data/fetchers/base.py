@@ -3,12 +3,15 @@ Base classes and interfaces for chess data fetching.
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any, AsyncGenerator, Union
-from dataclasses import dataclass
-from datetime import datetime, date
+from typing import List, Optional, Dict, Any, AsyncGenerator, Tuple, Union
+from dataclasses import dataclass, field
+from datetime import datetime, date, timezone
+from email.utils import parsedate_to_datetime
 import asyncio
+import time
 from enum import Enum
 
+import aiohttp
 from pydantic import BaseModel
 
 
@@ -30,7 +33,7 @@ class TimeClass(str, Enum):
     CORRESPONDENCE = "correspondence"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class FetchRequest:
     """Request parameters for fetching games."""
     username: str
@@ -40,44 +43,124 @@ class FetchRequest:
     time_classes: Optional[List[TimeClass]] = None
     max_games: Optional[int] = None
     include_analysis: bool = False
+    concurrency: int = 1  # Pages fetched at once, where the platform paginates
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class FetchResult:
     """Result of a fetch operation."""
     success: bool
     games_count: int
-    pgn_content: str
+    pgn_text: str  # Combined PGN, for platforms that return one stream
     metadata: Dict[str, Any]
     errors: List[str]
     source_info: Dict[str, Any]
+    # One PGN per game, for platforms that return games individually
+    pgn_games: List[str] = field(default_factory=list)
+    
+    @property
+    def pgn_content(self) -> str:
+        """All games as a single PGN text, joined on demand."""
+        if self.pgn_games:
+            return '\n\n'.join(self.pgn_games)
+        return self.pgn_text
 
 
 class RateLimiter:
-    """Simple rate limiter for API requests."""
+    """Token bucket rate limiter for API requests.
+    
+    Tokens refill at ``requests_per_second`` up to ``burst``. Each caller
+    takes a token (going into debt if none is left) under a lock and sleeps
+    outside it, so concurrent tasks share the budget without queueing on the
+    lock itself.
+    """
     
-    def __init__(self, requests_per_second: float = 1.0):
+    def __init__(self, requests_per_second: float = 1.0, burst: int = 1):
         self.requests_per_second = requests_per_second
-        self.last_request_time = 0.0
+        self.burst = burst
+        self.tokens = float(burst)
+        self.last_refill: Optional[float] = None
+        self.paused_until = 0.0
+        self._lock = asyncio.Lock()
+    
+    def pause(self, seconds: float):
+        """Hold every caller of wait() for ``seconds``, e.g. after a 429."""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
     
     async def wait(self):
         """Wait if necessary to respect rate limits."""
-        current_time = asyncio.get_event_loop().time()
-        time_since_last = current_time - self.last_request_time
-        min_interval = 1.0 / self.requests_per_second
-        
-        if time_since_last < min_interval:
-            await asyncio.sleep(min_interval - time_since_last)
+        async with self._lock:
+            current_time = time.monotonic()
+            # Tokens only start flowing again once a pause is over
+            start = max(current_time, self.paused_until)
+            if self.last_refill is not None:
+                elapsed = start - self.last_refill
+                self.tokens = min(
+                    float(self.burst), self.tokens + elapsed * self.requests_per_second
+                )
+            self.last_refill = start
+            
+            self.tokens -= 1
+            delay = start - current_time
+            if self.tokens < 0:
+                delay += -self.tokens / self.requests_per_second
         
-        self.last_request_time = asyncio.get_event_loop().time()
+        if delay:
+            await asyncio.sleep(delay)
+
+
+def parse_retry_after(value: Optional[str], default: float = 60.0) -> float:
+    """Seconds to wait according to a Retry-After header.
+    
+    The header holds either a number of seconds or an HTTP date.
+    """
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return default
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+async def error_body(response: aiohttp.ClientResponse, limit: int = 512) -> str:
+    """The start of an error response's body, for error messages.
+    
+    Error pages can be large HTML documents; only the first ``limit``
+    bytes are read and decoded.
+    """
+    body = await response.content.read(limit)
+    return body.decode('utf-8', 'replace')
+
+
+def create_session() -> aiohttp.ClientSession:
+    """HTTP session with a keep-alive connection pool, for sharing between
+    fetchers. Timeouts and headers are passed per request."""
+    connector = aiohttp.TCPConnector(
+        limit=32, limit_per_host=8, keepalive_timeout=75, ttl_dns_cache=300
+    )
+    return aiohttp.ClientSession(connector=connector)
 
 
 class BaseFetcher(ABC):
-    """Abstract base class for chess game fetchers."""
+    """Abstract base class for chess game fetchers.
+    
+    ``session`` may be injected by the owner of several fetchers; otherwise
+    entering the fetcher opens one of its own, closed again on exit.
+    """
+    
+    # Sent with every request
+    TIMEOUT = aiohttp.ClientTimeout(total=30)
+    HEADERS: Dict[str, str] = {}
     
     def __init__(self, rate_limit: float = 1.0):
         self.rate_limiter = RateLimiter(rate_limit)
-        self.session = None  # Will be set by implementing classes
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._owns_session = False
     
     @abstractmethod
     async def fetch_games(self, request: FetchRequest) -> FetchResult:
@@ -96,12 +179,17 @@ class BaseFetcher(ABC):
     
     async def __aenter__(self):
         """Async context manager entry."""
+        if self.session is None:
+            self.session = create_session()
+            self._owns_session = True
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit."""
-        if self.session:
+        if self._owns_session and self.session:
             await self.session.close()
+            self.session = None
+            self._owns_session = False
 
 
 class FetcherRegistry:
@@ -123,20 +211,14 @@ class FetcherRegistry:
         return list(self._fetchers.keys())
 
 
+@dataclass(slots=True, frozen=True)
 class GameFilter:
     """Filter games based on various criteria."""
-    
-    def __init__(self, 
-                 min_rating: Optional[int] = None,
-                 max_rating: Optional[int] = None,
-                 time_classes: Optional[List[TimeClass]] = None,
-                 color: Optional[str] = None,
-                 result: Optional[str] = None):
-        self.min_rating = min_rating
-        self.max_rating = max_rating
-        self.time_classes = time_classes or []
-        self.color = color  # 'white', 'black', or None for both
-        self.result = result  # '1-0', '0-1', '1/2-1/2', or None
+    min_rating: Optional[int] = None
+    max_rating: Optional[int] = None
+    time_classes: Tuple[TimeClass, ...] = ()
+    color: Optional[str] = None  # 'white', 'black', or None for both
+    result: Optional[str] = None  # '1-0', '0-1', '1/2-1/2', or None
     
     def should_include(self, game_metadata: Dict[str, Any]) -> bool:
         """Check if a game should be included based on filters."""
@@ -4,62 +4,212 @@ Official API documentation: https://www.chess.com/news/view/published-data-api
 """
 
 import asyncio
+import functools
 import json
+import logging
+import re
 from datetime import datetime, date
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 import calendar
 
 import aiohttp
 import backoff
-from .base import BaseFetcher, FetchRequest, FetchResult, Platform, TimeClass
+from cachetools import Cache, LRUCache, TTLCache
+
+from .base import (
+    BaseFetcher, FetchRequest, FetchResult, Platform, TimeClass, parse_retry_after
+)
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# HTTP/2 lets concurrent archive downloads share one connection; without
+# httpx and h2, requests go through the shared aiohttp session instead
+try:
+    import h2  # noqa: F401  (required by httpx for http2=True)
+    import httpx
+    HTTP2_AVAILABLE = True
+    _RETRY_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError, httpx.TransportError)
+except ImportError:
+    HTTP2_AVAILABLE = False
+    _RETRY_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError)
+
+logger = logging.getLogger(__name__)
+
+# Monthly archive URL suffix: .../games/2023/01
+_ARCHIVE_MONTH_RE = re.compile(r'/(\d{4})/(\d{2})$')
+
+# Chess.com time classes; anything else counts as rapid
+_TIME_CLASSES = {
+    'bullet': TimeClass.BULLET,
+    'blitz': TimeClass.BLITZ,
+    'rapid': TimeClass.RAPID,
+    'daily': TimeClass.CORRESPONDENCE,
+}
+
+
+@functools.lru_cache(maxsize=4096)
+def _archive_month(url: str) -> Optional[Tuple[int, int]]:
+    """(year, month) of a monthly archive URL, or None if it isn't one."""
+    match = _ARCHIVE_MONTH_RE.search(url)
+    if not match:
+        return None
+    year, month = int(match[1]), int(match[2])
+    if not 1 <= month <= 12:
+        return None
+    return year, month
 
 
 class ChessComFetcher(BaseFetcher):
     """Fetcher for Chess.com games using their public API."""
     
     BASE_URL = "https://api.chess.com/pub"
+    TIMEOUT = aiohttp.ClientTimeout(total=30)
+    HEADERS = {
+        'User-Agent': 'AI-Chess-Tournament-Prep-Agent/1.0 (Educational Purpose)',
+    }
+    
+    # Response cache lifetimes, in seconds
+    PROFILE_CACHE_TTL = 3600
+    ARCHIVE_LIST_CACHE_TTL = 24 * 3600
+    # Budget for cached monthly archives, counted in raw JSON bytes; the
+    # parsed objects take several times as much memory
+    MONTHLY_ARCHIVE_CACHE_BYTES = 64 * 1024 * 1024
     
     def __init__(self):
         super().__init__(rate_limit=1.0)  # Chess.com asks for max 1 req/sec
+        # Responses keyed by URL, stored as (parsed body, raw body size).
+        # Monthly archives of past months no longer change, so they are kept
+        # until evicted by size; the current month is not cached at all.
+        self._profile_cache: TTLCache = TTLCache(maxsize=1024, ttl=self.PROFILE_CACHE_TTL)
+        self._archive_list_cache: TTLCache = TTLCache(
+            maxsize=1024, ttl=self.ARCHIVE_LIST_CACHE_TTL
+        )
+        self._monthly_archive_cache: LRUCache = LRUCache(
+            maxsize=self.MONTHLY_ARCHIVE_CACHE_BYTES, getsizeof=lambda entry: entry[1]
+        )
+        self._http2_client = None
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Close connections opened for this fetcher alone."""
+        if self._owns_session:
+            await self.close()
+        await super().__aexit__(exc_type, exc_val, exc_tb)
+    
+    async def close(self):
+        """Close the HTTP/2 client, if one was opened."""
+        if self._http2_client is not None:
+            await self._http2_client.aclose()
+            self._http2_client = None
     
     def supports_platform(self, platform: Platform) -> bool:
         """Check if this fetcher supports the given platform."""
         return platform == Platform.CHESS_COM
     
-    async def __aenter__(self):
-        """Initialize aiohttp session."""
-        timeout = aiohttp.ClientTimeout(total=30)
-        headers = {
-            'User-Agent': 'AI-Chess-Tournament-Prep-Agent/1.0 (Educational Purpose)',
-        }
-        self.session = aiohttp.ClientSession(timeout=timeout, headers=headers)
-        return self
+    async def _get(self, url: str) -> Tuple[int, Any, bytes]:
+        """GET a URL over HTTP/2 if available, else the aiohttp session.
+        
+        Returns the status, the response headers and the raw body.
+        """
+        if HTTP2_AVAILABLE:
+            if self._http2_client is None:
+                self._http2_client = httpx.AsyncClient(
+                    http2=True,
+                    headers=self.HEADERS,
+                    timeout=self.TIMEOUT.total,
+                    limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+                )
+            response = await self._http2_client.get(url)
+            return response.status_code, response.headers, response.content
+        
+        async with self.session.get(url, headers=self.HEADERS, timeout=self.TIMEOUT) as response:
+            return response.status, response.headers, await response.read()
     
     @backoff.on_exception(
         backoff.expo,
-        (aiohttp.ClientError, asyncio.TimeoutError),
+        _RETRY_ERRORS,
         max_tries=3,
-        max_time=60
+        max_time=60,
+        # Randomized waits keep archive downloads that failed together from
+        # retrying in lockstep
+        jitter=backoff.full_jitter,
+        base=2,
+        factor=0.5
     )
+    async def _request_body(self, url: str) -> bytes:
+        """Make a rate-limited request to Chess.com API, returning the raw body."""
+        await self.rate_limiter.wait()
+        
+        status, headers, body = await self._get(url)
+        if status in (429, 503):  # Rate limited or overloaded
+            # Hold back every request sharing the limiter, not just this
+            # one; the retry then waits in rate_limiter.wait()
+            self.rate_limiter.pause(parse_retry_after(headers.get('Retry-After')))
+            raise aiohttp.ClientError(f"HTTP {status}: rate limited")
+        
+        if status != 200:
+            raise aiohttp.ClientError(f"HTTP {status}: {body.decode('utf-8', 'replace')}")
+        
+        return body
+    
     async def _make_request(self, url: str) -> Dict[str, Any]:
         """Make a rate-limited request to Chess.com API."""
-        await self.rate_limiter.wait()
+        # Monthly archives run to several MB; decode the raw body directly
+        return _json_loads(await self._request_body(url))
+    
+    def _cache_for(self, url: str) -> Optional[Cache]:
+        """Pick the response cache for an API URL, or None if uncacheable."""
+        parts = url[len(self.BASE_URL):].strip('/').split('/')
+        if parts[0] != 'player' or len(parts) < 2:
+            return None
         
-        async with self.session.get(url) as response:
-            if response.status == 429:  # Rate limited
-                await asyncio.sleep(60)  # Wait 1 minute
-                raise aiohttp.ClientError("Rate limited")
-            
-            if response.status != 200:
-                raise aiohttp.ClientError(f"HTTP {response.status}: {await response.text()}")
-            
-            return await response.json()
+        if len(parts) == 2 or parts[2:] == ['stats']:
+            return self._profile_cache
+        if parts[2:] == ['games', 'archives']:
+            return self._archive_list_cache
+        if len(parts) == 5 and parts[2] == 'games':
+            month = _archive_month(url)
+            today = date.today()
+            if month and month < (today.year, today.month):
+                return self._monthly_archive_cache
+        return None
+    
+    async def _cached_request(self, url: str) -> Dict[str, Any]:
+        """Make a request, serving cacheable endpoints from memory."""
+        cache = self._cache_for(url)
+        if cache is None:
+            return await self._make_request(url)
+        
+        try:
+            return cache[url][0]
+        except KeyError:
+            pass
+        
+        body = await self._request_body(url)
+        data = _json_loads(body)
+        try:
+            cache[url] = (data, len(body))
+        except ValueError:
+            pass  # Larger than the whole cache
+        return data
+    
+    async def _fetch_archive(self, url: str, semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+        """Fetch one monthly archive, holding a slot of ``semaphore``."""
+        async with semaphore:
+            return await self._cached_request(url)
     
     async def get_player_info(self, username: str) -> Optional[Dict[str, Any]]:
         """Get player profile information."""
+        return await self._get_player_info(username.lower())
+    
+    async def _get_player_info(self, username: str) -> Optional[Dict[str, Any]]:
+        """get_player_info for a username that is already lowercase."""
         try:
-            url = f"{self.BASE_URL}/player/{username.lower()}"
-            data = await self._make_request(url)
+            url = f"{self.BASE_URL}/player/{username}"
+            data = await self._cached_request(url)
             
             return {
                 'username': data.get('username'),
@@ -73,26 +223,30 @@ class ChessComFetcher(BaseFetcher):
                 'platform': Platform.CHESS_COM
             }
         except Exception as e:
-            print(f"Error fetching player info for {username}: {e}")
+            logger.warning("Error fetching player info for %s: %s", username, e)
             return None
     
     async def get_player_stats(self, username: str) -> Optional[Dict[str, Any]]:
         """Get player ratings and statistics."""
         try:
             url = f"{self.BASE_URL}/player/{username.lower()}/stats"
-            return await self._make_request(url)
+            return await self._cached_request(url)
         except Exception as e:
-            print(f"Error fetching player stats for {username}: {e}")
+            logger.warning("Error fetching player stats for %s: %s", username, e)
             return None
     
     async def get_game_archives(self, username: str) -> List[str]:
         """Get list of available game archives for a player."""
+        return await self._get_game_archives(username.lower())
+    
+    async def _get_game_archives(self, username: str) -> List[str]:
+        """get_game_archives for a username that is already lowercase."""
         try:
-            url = f"{self.BASE_URL}/player/{username.lower()}/games/archives"
-            data = await self._make_request(url)
+            url = f"{self.BASE_URL}/player/{username}/games/archives"
+            data = await self._cached_request(url)
             return data.get('archives', [])
         except Exception as e:
-            print(f"Error fetching game archives for {username}: {e}")
+            logger.warning("Error fetching game archives for %s: %s", username, e)
             return []
     
     def _filter_archives_by_date(self, archives: List[str], 
@@ -102,38 +256,31 @@ class ChessComFetcher(BaseFetcher):
         if not start_date and not end_date:
             return archives
         
+        first = (start_date.year, start_date.month) if start_date else None
+        last = (end_date.year, end_date.month) if end_date else None
+        
         filtered = []
         for archive_url in archives:
-            # Extract year/month from URL: .../games/2023/01
-            parts = archive_url.split('/')
-            if len(parts) >= 2:
-                try:
-                    year = int(parts[-2])
-                    month = int(parts[-1])
-                    archive_date = date(year, month, 1)
-                    
-                    # Check if archive falls within date range
-                    if start_date and archive_date < date(start_date.year, start_date.month, 1):
-                        continue
-                    if end_date and archive_date > date(end_date.year, end_date.month, 1):
-                        continue
-                    
-                    filtered.append(archive_url)
-                except ValueError:
-                    # Invalid date format, skip
-                    continue
+            month = _archive_month(archive_url)
+            if month is None:
+                # Invalid date format, skip
+                continue
+            
+            # Check if archive falls within date range
+            if first and month < first:
+                continue
+            if last and month > last:
+                continue
+            
+            filtered.append(archive_url)
         
         return filtered
     
-    def _map_chess_com_time_class(self, time_class: str) -> TimeClass:
+    @staticmethod
+    @functools.lru_cache(maxsize=16)
+    def _map_chess_com_time_class(time_class: str) -> TimeClass:
         """Map Chess.com time class to our enum."""
-        mapping = {
-            'bullet': TimeClass.BULLET,
-            'blitz': TimeClass.BLITZ,
-            'rapid': TimeClass.RAPID,
-            'daily': TimeClass.CORRESPONDENCE,
-        }
-        return mapping.get(time_class.lower(), TimeClass.RAPID)
+        return _TIME_CLASSES.get(time_class.lower(), TimeClass.RAPID)
     
     def _should_include_game(self, game: Dict[str, Any], 
                            request: FetchRequest, 
@@ -163,12 +310,13 @@ class ChessComFetcher(BaseFetcher):
             return FetchResult(
                 success=False,
                 games_count=0,
-                pgn_content="",
+                pgn_text="",
                 metadata={},
                 errors=[f"Platform {request.platform} not supported"],
                 source_info={}
             )
         
+        # Normalized once; the helpers below take it as-is
         username = request.username.lower()
         errors = []
         all_pgns = []
@@ -176,24 +324,24 @@ class ChessComFetcher(BaseFetcher):
         
         try:
             # Get player info first
-            player_info = await self.get_player_info(username)
+            player_info = await self._get_player_info(username)
             if not player_info:
                 return FetchResult(
                     success=False,
                     games_count=0,
-                    pgn_content="",
+                    pgn_text="",
                     metadata={},
                     errors=[f"Player {username} not found"],
                     source_info={}
                 )
             
             # Get available archives
-            archives = await self.get_game_archives(username)
+            archives = await self._get_game_archives(username)
             if not archives:
                 return FetchResult(
                     success=False,
                     games_count=0,
-                    pgn_content="",
+                    pgn_text="",
                     metadata=player_info,
                     errors=[f"No game archives found for {username}"],
                     source_info={}
@@ -207,13 +355,25 @@ class ChessComFetcher(BaseFetcher):
             # Sort archives in reverse chronological order (newest first)
             filtered_archives.sort(reverse=True)
             
-            # Process each archive
-            for archive_url in filtered_archives:
-                try:
-                    archive_data = await self._make_request(archive_url)
-                    games = archive_data.get('games', [])
+            # Process archives newest first while up to `concurrency`
+            # downloads run ahead; whatever is still pending once enough
+            # games have been collected is cancelled
+            semaphore = asyncio.Semaphore(max(1, request.concurrency))
+            pending = [
+                asyncio.ensure_future(self._fetch_archive(url, semaphore))
+                for url in filtered_archives
+            ]
+            archives_processed = 0
+            try:
+                for archive_url, task in zip(filtered_archives, pending):
+                    archives_processed += 1
+                    try:
+                        archive_data = await task
+                    except Exception as e:
+                        errors.append(f"Error processing archive {archive_url}: {e}")
+                        continue
                     
-                    for game in games:
+                    for game in archive_data.get('games', []):
                         if request.max_games and games_count >= request.max_games:
                             break
                         
@@ -225,21 +385,17 @@ class ChessComFetcher(BaseFetcher):
                     
                     if request.max_games and games_count >= request.max_games:
                         break
-                        
-                except Exception as e:
-                    errors.append(f"Error processing archive {archive_url}: {e}")
-                    continue
-            
-            # Combine all PGNs
-            combined_pgn = '\n\n'.join(all_pgns)
+            finally:
+                for task in pending:
+                    task.cancel()
             
             return FetchResult(
                 success=True,
                 games_count=games_count,
-                pgn_content=combined_pgn,
+                pgn_text="",
                 metadata={
                     'player_info': player_info,
-                    'archives_processed': len(filtered_archives),
+                    'archives_processed': archives_processed,
                     'total_archives': len(archives)
                 },
                 errors=errors,
@@ -247,15 +403,17 @@ class ChessComFetcher(BaseFetcher):
                     'platform': Platform.CHESS_COM,
                     'api_version': 'public',
                     'fetch_date': datetime.now().isoformat()
-                }
+                },
+                pgn_games=all_pgns
             )
             
         except Exception as e:
             return FetchResult(
                 success=False,
                 games_count=games_count,
-                pgn_content='\n\n'.join(all_pgns) if all_pgns else "",
+                pgn_text="",
                 metadata={},
                 errors=errors + [f"Fatal error: {e}"],
-                source_info={'platform': Platform.CHESS_COM}
+                source_info={'platform': Platform.CHESS_COM},
+                pgn_games=all_pgns
             )
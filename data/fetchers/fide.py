@@ -4,17 +4,180 @@ Since FIDE doesn't have a public API, we fetch from reliable third-party sources
 """
 
 import asyncio
+import bisect
 import re
 from datetime import datetime, date, timedelta
-from typing import List, Optional, Dict, Any, Set
+from typing import Iterator, List, Optional, Dict, Any, Set, Tuple
 from pathlib import Path
 import zipfile
 import io
 
 import aiohttp
 import backoff
-from bs4 import BeautifulSoup
-from .base import BaseFetcher, FetchRequest, FetchResult, Platform, TimeClass
+from cachetools import TTLCache
+from .base import (
+    BaseFetcher, FetchRequest, FetchResult, Platform, TimeClass, error_body, parse_retry_after
+)
+
+# Batch TWIC scans match every player name in one pass over each game's
+# White/Black tags; without pyahocorasick the names are checked one by one
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Latest issue number on the TWIC front page
+_TWIC_ISSUE_RE = re.compile(rb'TWIC (\d+)')
+
+# Blank line followed by the next game's first tag
+_GAME_BOUNDARY_RE = re.compile(rb'\n\n(?=\[Event )')
+
+# Latest TWIC issue number, shared by all fetchers; a new issue comes out weekly
+TWIC_LATEST_ISSUE_TTL = 3600
+_twic_latest_cache: TTLCache = TTLCache(maxsize=1, ttl=TWIC_LATEST_ISSUE_TTL)
+
+# TWIC issue 1 came out on this date; issues are (nearly) weekly
+TWIC_FIRST_ISSUE_DATE = date(1994, 9, 17)
+# Slack around the estimated issue dates when filtering by a date range;
+# an issue also carries games from the week before it
+TWIC_DATE_MARGIN = timedelta(weeks=2)
+
+
+def _tag_value(header: bytes, prefix: bytes) -> bytes:
+    """Value of the first tag matching ``prefix`` in a PGN header, or b''."""
+    start = header.find(prefix)
+    if start < 0:
+        return b''
+    start += len(prefix)
+    end = header.find(b'"', start)
+    return header[start:end] if end >= 0 else header[start:]
+
+
+def _twic_issue_date(issue: int, latest_issue: Optional[int] = None) -> date:
+    """Estimated publication date of a TWIC issue.
+    
+    Issues are spread evenly between issue 1 and ``latest_issue`` (taken
+    to be this week's), which absorbs the weeks TWIC skipped; without the
+    latest issue number a strict weekly cadence is assumed.
+    """
+    days_per_issue = 7.0
+    if latest_issue and latest_issue > 1:
+        days_per_issue = (date.today() - TWIC_FIRST_ISSUE_DATE).days / (latest_issue - 1)
+    return TWIC_FIRST_ISSUE_DATE + timedelta(days=round(days_per_issue * (issue - 1)))
+
+
+def _player_name_keys(player_name: str) -> List[str]:
+    """Lowercased strings that identify a player in a White/Black tag: the
+    full name, plus a last name longer than three letters."""
+    player_name_lower = player_name.lower().strip()
+    names = [player_name_lower]
+    name_parts = player_name_lower.split()
+    if len(name_parts) > 1 and len(name_parts[-1]) > 3:  # Avoid matching very short names
+        names.append(name_parts[-1])
+    return names
+
+
+def _normalize_newlines(pgn_content: bytes) -> bytes:
+    if b'\r' in pgn_content:
+        return pgn_content.replace(b'\r\n', b'\n')
+    return pgn_content
+
+
+def _game_players(game: bytes) -> str:
+    """Lowercased White and Black values of a game, joined by a newline."""
+    header_end = game.find(b'\n\n')
+    header = game if header_end < 0 else game[:header_end]
+    players = _tag_value(header, b'\n[White "') + b'\n' + _tag_value(header, b'\n[Black "')
+    return players.decode('utf-8', errors='ignore').lower()
+
+
+def _game_starts(pgn_content: bytes) -> List[int]:
+    """Offsets at which each game (and any preamble) begins."""
+    starts = [0]
+    starts.extend(m.end() for m in _GAME_BOUNDARY_RE.finditer(pgn_content))
+    return starts
+
+
+def _game_at(pgn_content: bytes, starts: List[int], i: int) -> Optional[bytes]:
+    """The ``i``-th game's bytes, or None for a preamble before the first game."""
+    end = starts[i + 1] - 2 if i + 1 < len(starts) else len(pgn_content)
+    game = pgn_content[starts[i]:end]
+    if not i:
+        # Anything before the first game is skipped
+        game = game.lstrip()
+        if not game.startswith(b'[Event '):
+            return None
+    return game
+
+
+def _iter_pgn_games(pgn_content: bytes) -> Iterator[Tuple[bytes, str]]:
+    """Yield each game in a PGN file with its lowercased White and Black
+    values, joined by a newline."""
+    pgn_content = _normalize_newlines(pgn_content)
+    starts = _game_starts(pgn_content)
+    for i in range(len(starts)):
+        game = _game_at(pgn_content, starts, i)
+        if game is not None:
+            yield game, _game_players(game)
+
+
+def _iter_candidate_games(pgn_content: bytes, names: List[str]) -> Iterator[Tuple[bytes, str]]:
+    """Like ``_iter_pgn_games``, but only yields games whose text contains
+    one of the (ASCII, lowercased) ``names`` somewhere.
+    
+    The names are found with one search over the whole file and each hit
+    is mapped to its game by bisecting the game start offsets, so games
+    that can't match are never sliced out.
+    """
+    pgn_content = _normalize_newlines(pgn_content)
+    lower = pgn_content.lower()
+    
+    hits = []
+    for name in names:
+        key = name.encode('ascii')
+        pos = lower.find(key)
+        while pos != -1:
+            hits.append(pos)
+            pos = lower.find(key, pos + 1)
+    if not hits:
+        return
+    
+    starts = _game_starts(pgn_content)
+    for i in sorted({bisect.bisect_right(starts, pos) - 1 for pos in hits}):
+        game = _game_at(pgn_content, starts, i)
+        if game is not None:
+            yield game, _game_players(game)
+
+
+def _build_name_matcher(player_names: List[str]):
+    """Return a function mapping a game's players string to the indices of
+    the ``player_names`` that appear in it."""
+    keys: Dict[str, Set[int]] = {}
+    for index, player_name in enumerate(player_names):
+        for key in _player_name_keys(player_name):
+            keys.setdefault(key, set()).add(index)
+    
+    if AHOCORASICK_AVAILABLE:
+        automaton = ahocorasick.Automaton()
+        for key, indices in keys.items():
+            automaton.add_word(key, indices)
+        automaton.make_automaton()
+        
+        def match(players: str) -> Set[int]:
+            matched = set()
+            for _, indices in automaton.iter(players):
+                matched |= indices
+            return matched
+    else:
+        def match(players: str) -> Set[int]:
+            matched = set()
+            for key, indices in keys.items():
+                if key in players:
+                    matched |= indices
+            return matched
+    
+    return match
 
 
 class FideFetcher(BaseFetcher):
@@ -22,8 +185,15 @@ class FideFetcher(BaseFetcher):
     
     TWIC_BASE_URL = "https://theweekinchess.com"
     PGN_MENTOR_BASE_URL = "https://www.pgnmentor.com"
+    TIMEOUT = aiohttp.ClientTimeout(total=120)  # Longer timeout for large files
+    HEADERS = {
+        'User-Agent': 'Mozilla/5.0 (compatible; AI-Chess-Tournament-Prep-Agent/1.0)',
+    }
     LICHESS_MASTERS_URL = "https://lichess.org/api/games/search"
     
+    # TWIC issues downloaded at once
+    TWIC_CONCURRENCY = 4
+    
     def __init__(self):
         super().__init__(rate_limit=0.5)  # Be conservative with scraping
     
@@ -31,15 +201,6 @@ class FideFetcher(BaseFetcher):
         """Check if this fetcher supports the given platform."""
         return platform in [Platform.FIDE, Platform.TWIC, Platform.PGN_MENTOR]
     
-    async def __aenter__(self):
-        """Initialize aiohttp session."""
-        timeout = aiohttp.ClientTimeout(total=120)  # Longer timeout for large files
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (compatible; AI-Chess-Tournament-Prep-Agent/1.0)',
-        }
-        self.session = aiohttp.ClientSession(timeout=timeout, headers=headers)
-        return self
-    
     @backoff.on_exception(
         backoff.expo,
         (aiohttp.ClientError, asyncio.TimeoutError),
@@ -50,13 +211,14 @@ class FideFetcher(BaseFetcher):
         """Make a rate-limited request."""
         await self.rate_limiter.wait()
         
-        async with self.session.get(url) as response:
+        async with self.session.get(url, headers=self.HEADERS, timeout=self.TIMEOUT) as response:
             if response.status == 429:  # Rate limited
-                await asyncio.sleep(60)
+                # The retry waits in rate_limiter.wait(); the body is irrelevant
+                self.rate_limiter.pause(parse_retry_after(response.headers.get('Retry-After')))
                 raise aiohttp.ClientError("Rate limited")
             
             if response.status != 200:
-                raise aiohttp.ClientError(f"HTTP {response.status}: {await response.text()}")
+                raise aiohttp.ClientError(f"HTTP {response.status}: {await error_body(response)}")
             
             if stream:
                 return await response.read()  # Return bytes for downloads
@@ -72,19 +234,32 @@ class FideFetcher(BaseFetcher):
             'note': 'FIDE/OTB games - limited player info available'
         }
     
+    async def _get_latest_twic_issue(self) -> Optional[int]:
+        """Latest TWIC issue number, scraped from the TWIC front page, or
+        None if it can't be determined."""
+        try:
+            return _twic_latest_cache['latest']
+        except KeyError:
+            pass
+        
+        try:
+            main_page = await self._make_request(f"{self.TWIC_BASE_URL}/twic.html", stream=True)
+        except Exception:
+            return None
+        
+        # Look for the latest issue number in the page
+        latest_match = _TWIC_ISSUE_RE.search(main_page)
+        if not latest_match:
+            return None
+        
+        latest = _twic_latest_cache['latest'] = int(latest_match.group(1))
+        return latest
+    
     async def get_twic_archives(self, start_issue: int = 1, end_issue: int = None) -> List[Dict[str, Any]]:
         """Get list of TWIC archives available for download."""
+        latest_issue = await self._get_latest_twic_issue()
         if end_issue is None:
-            # Get the latest issue number by scraping the TWIC website
-            try:
-                main_page = await self._make_request(f"{self.TWIC_BASE_URL}/twic.html")
-                soup = BeautifulSoup(main_page, 'html.parser')
-                
-                # Look for the latest issue number in the page
-                latest_match = re.search(r'TWIC (\d+)', main_page)
-                end_issue = int(latest_match.group(1)) if latest_match else 1500
-            except:
-                end_issue = 1500  # Fallback to a reasonable number
+            end_issue = latest_issue or 1500  # Fallback to a reasonable number
         
         archives = []
         for issue in range(start_issue, end_issue + 1):
@@ -93,74 +268,183 @@ class FideFetcher(BaseFetcher):
             archives.append({
                 'issue': issue,
                 'url': archive_url,
+                'date': _twic_issue_date(issue, latest_issue),  # Estimated
                 'estimated_games': 1000  # Rough estimate per issue
             })
         
         return archives
     
-    def _extract_games_from_pgn_content(self, pgn_content: str, player_name: str) -> List[str]:
-        """Extract games where the specified player participated."""
+    def _extract_games_from_pgn_content(self, pgn_content: bytes, player_name: str) -> List[str]:
+        """Extract games where the specified player participated.
+        
+        Works on the raw file bytes; only the White/Black values and the
+        games that match are decoded. The player's name, or a last name
+        longer than three letters, has to appear in one of those tags.
+        """
+        names = _player_name_keys(player_name)
+        
+        # Byte-level lowercasing only covers ASCII, so other names go
+        # through every game's tags
+        if all(name.isascii() for name in names):
+            candidates = _iter_candidate_games(pgn_content, names)
+        else:
+            candidates = _iter_pgn_games(pgn_content)
+        
+        games = []
+        for game, players in candidates:
+            if any(name in players for name in names):
+                games.append(game.rstrip().decode('utf-8', errors='ignore'))
+        
+        return games
+    
+    async def _fetch_twic_games(self, archive: Dict[str, Any], player_name: str,
+                                semaphore: asyncio.Semaphore) -> List[str]:
+        """Download one TWIC issue and return the player's games from it."""
+        async with semaphore:
+            zip_data = await self._make_request(archive['url'], stream=True)
+        
+        # Unzipping and scanning are CPU work; keep them off the event loop
+        return await asyncio.to_thread(self._extract_games_from_zip, zip_data, player_name)
+    
+    def _extract_games_from_zip(self, zip_data: bytes, player_name: str) -> List[str]:
+        """Extract the player's games from every PGN file in a ZIP archive."""
         games = []
-        current_game = []
-        in_game = False
+        with zipfile.ZipFile(io.BytesIO(zip_data)) as zip_file:
+            for file_name in zip_file.namelist():
+                if file_name.endswith('.pgn'):
+                    # Scan the raw bytes; only matching games are decoded
+                    games.extend(
+                        self._extract_games_from_pgn_content(zip_file.read(file_name), player_name)
+                    )
+        return games
+    
+    def _twic_issue_range(self, request: FetchRequest) -> Tuple[int, Optional[int]]:
+        """TWIC issues to check for the request's date range."""
+        start_issue = 1  # TWIC started in 1994
+        end_issue = None
+        
+        if request.start_date:
+            # Rough calculation: TWIC issue 1 was in 1994
+            # About 50 issues per year
+            years_since_1994 = request.start_date.year - 1994
+            start_issue = max(1, years_since_1994 * 50)
         
-        # Normalize player name for matching
-        player_name_lower = player_name.lower().strip()
+        if request.end_date:
+            years_since_1994 = request.end_date.year - 1994
+            end_issue = min(1500, years_since_1994 * 50 + 100)  # Add buffer
         
-        for line in pgn_content.split('\n'):
-            if line.startswith('[Event '):
-                if in_game and current_game:
-                    # Check if previous game contains our player
-                    game_text = '\n'.join(current_game)
-                    if self._game_contains_player(game_text, player_name_lower):
-                        games.append(game_text)
-                
-                # Start new game
-                current_game = [line]
-                in_game = True
-            elif in_game:
-                current_game.append(line)
-                
-                # End of game (empty line after moves)
-                if not line.strip() and len(current_game) > 10:
-                    game_text = '\n'.join(current_game)
-                    if self._game_contains_player(game_text, player_name_lower):
-                        games.append(game_text)
-                    current_game = []
-                    in_game = False
+        return start_issue, end_issue
+    
+    async def _twic_archives_for(self, start_issue: int, end_issue: Optional[int],
+                                 start_date: Optional[date] = None,
+                                 end_date: Optional[date] = None) -> List[Dict[str, Any]]:
+        """The most recent TWIC archives in an issue range whose estimated
+        dates fall within the date range, if one is given."""
+        archives = await self.get_twic_archives(start_issue, end_issue)
         
-        # Handle last game
-        if in_game and current_game:
-            game_text = '\n'.join(current_game)
-            if self._game_contains_player(game_text, player_name_lower):
-                games.append(game_text)
+        # The issue range is only a rough guess; drop issues from outside
+        # the date range before anything is downloaded
+        if start_date:
+            archives = [a for a in archives if a['date'] >= start_date - TWIC_DATE_MARGIN]
+        if end_date:
+            archives = [a for a in archives if a['date'] <= end_date + TWIC_DATE_MARGIN]
         
+        # Limit the number of archives to process (to avoid overwhelming)
+        max_archives = min(20, len(archives))  # Process at most 20 issues
+        return archives[-max_archives:]  # Take the most recent ones
+    
+    def _extract_batch_from_zip(self, zip_data: bytes, player_names: List[str]) -> List[List[str]]:
+        """Extract every player's games from a ZIP archive in a single scan."""
+        match = _build_name_matcher(player_names)
+        games: List[List[str]] = [[] for _ in player_names]
+        with zipfile.ZipFile(io.BytesIO(zip_data)) as zip_file:
+            for file_name in zip_file.namelist():
+                if not file_name.endswith('.pgn'):
+                    continue
+                for game, players in _iter_pgn_games(zip_file.read(file_name)):
+                    matched = match(players)
+                    if matched:
+                        text = game.rstrip().decode('utf-8', errors='ignore')
+                        for index in matched:
+                            games[index].append(text)
         return games
     
-    def _game_contains_player(self, game_pgn: str, player_name_lower: str) -> bool:
-        """Check if a game PGN contains the specified player."""
-        game_lower = game_pgn.lower()
+    async def _fetch_twic_batch_games(self, archive: Dict[str, Any], player_names: List[str],
+                                      semaphore: asyncio.Semaphore) -> List[List[str]]:
+        """Download one TWIC issue and return each player's games from it."""
+        async with semaphore:
+            zip_data = await self._make_request(archive['url'], stream=True)
         
-        # Look for player name in White and Black tags
-        white_match = re.search(r'\[White "([^"]+)"\]', game_lower)
-        black_match = re.search(r'\[Black "([^"]+)"\]', game_lower)
+        return await asyncio.to_thread(self._extract_batch_from_zip, zip_data, player_names)
+    
+    async def fetch_from_twic_batch(self, requests: List[FetchRequest]) -> List[FetchResult]:
+        """Fetch TWIC games for several players, scanning each issue once.
         
-        if white_match and player_name_lower in white_match.group(1):
-            return True
-        if black_match and player_name_lower in black_match.group(1):
-            return True
+        Covers the union of the requests' date ranges; each player's games
+        are trimmed to their own ``max_games``. Results are in request order.
+        """
+        player_names = [request.username for request in requests]
+        errors = []
+        all_games: List[List[str]] = [[] for _ in requests]
+        processed_issues = 0
+        fatal = False
+        
+        try:
+            ranges = [self._twic_issue_range(request) for request in requests]
+            start_issue = min(start for start, _ in ranges)
+            end_issue = None
+            if all(end is not None for _, end in ranges):
+                end_issue = max(end for _, end in ranges)
+            start_date = end_date = None
+            if all(request.start_date for request in requests):
+                start_date = min(request.start_date for request in requests)
+            if all(request.end_date for request in requests):
+                end_date = max(request.end_date for request in requests)
+            archives = await self._twic_archives_for(start_issue, end_issue, start_date, end_date)
+            
+            semaphore = asyncio.Semaphore(self.TWIC_CONCURRENCY)
+            pending = [
+                asyncio.ensure_future(self._fetch_twic_batch_games(archive, player_names, semaphore))
+                for archive in archives
+            ]
+            try:
+                for archive, task in zip(archives, pending):
+                    try:
+                        for games, issue_games in zip(all_games, await task):
+                            games.extend(issue_games)
+                        processed_issues += 1
+                    except Exception as e:
+                        errors.append(f"Error processing TWIC issue {archive['issue']}: {e}")
+            finally:
+                for task in pending:
+                    task.cancel()
         
-        # Also check for partial name matches (last name only)
-        name_parts = player_name_lower.split()
-        if len(name_parts) > 1:
-            last_name = name_parts[-1]
-            if len(last_name) > 3:  # Avoid matching very short names
-                if white_match and last_name in white_match.group(1):
-                    return True
-                if black_match and last_name in black_match.group(1):
-                    return True
+        except Exception as e:
+            errors.append(f"Fatal error: {e}")
+            fatal = True
         
-        return False
+        results = []
+        for request, games in zip(requests, all_games):
+            if request.max_games:
+                games = games[:request.max_games]
+            results.append(FetchResult(
+                success=not fatal,
+                games_count=len(games),
+                pgn_text="",
+                metadata={
+                    'player_name': request.username,
+                    'twic_issues_processed': processed_issues,
+                    'source': 'The Week in Chess'
+                },
+                errors=list(errors),
+                source_info={
+                    'platform': Platform.TWIC,
+                    'fetch_date': datetime.now().isoformat(),
+                    'source_url': self.TWIC_BASE_URL
+                },
+                pgn_games=games
+            ))
+        return results
     
     async def fetch_from_twic(self, request: FetchRequest) -> FetchResult:
         """Fetch games from The Week in Chess archives."""
@@ -170,65 +454,40 @@ class FideFetcher(BaseFetcher):
         processed_issues = 0
         
         try:
-            # Calculate which TWIC issues to check based on date range
-            start_issue = 1  # TWIC started in 1994
-            end_issue = None
-            
-            if request.start_date:
-                # Rough calculation: TWIC issue 1 was in 1994
-                # About 50 issues per year
-                years_since_1994 = request.start_date.year - 1994
-                start_issue = max(1, years_since_1994 * 50)
-            
-            if request.end_date:
-                years_since_1994 = request.end_date.year - 1994
-                end_issue = min(1500, years_since_1994 * 50 + 100)  # Add buffer
-            
-            # Get available archives
-            archives = await self.get_twic_archives(start_issue, end_issue)
-            
-            # Limit the number of archives to process (to avoid overwhelming)
-            max_archives = min(20, len(archives))  # Process at most 20 issues
-            archives = archives[-max_archives:]  # Take the most recent ones
+            archives = await self._twic_archives_for(
+                *self._twic_issue_range(request), request.start_date, request.end_date
+            )
             
-            for archive in archives:
-                if request.max_games and len(all_games) >= request.max_games:
-                    break
-                
-                try:
-                    # Download the ZIP file
-                    zip_data = await self._make_request(archive['url'], stream=True)
-                    
-                    # Extract PGN from ZIP
-                    with zipfile.ZipFile(io.BytesIO(zip_data)) as zip_file:
-                        for file_name in zip_file.namelist():
-                            if file_name.endswith('.pgn'):
-                                pgn_content = zip_file.read(file_name).decode('utf-8', errors='ignore')
-                                
-                                # Extract games for our player
-                                player_games = self._extract_games_from_pgn_content(pgn_content, player_name)
-                                all_games.extend(player_games)
-                                
-                                # Stop if we have enough games
-                                if request.max_games and len(all_games) >= request.max_games:
-                                    break
-                    
-                    processed_issues += 1
+            # Download up to TWIC_CONCURRENCY issues at once, consuming them
+            # in order; whatever is still pending once enough games have been
+            # collected is cancelled
+            semaphore = asyncio.Semaphore(self.TWIC_CONCURRENCY)
+            pending = [
+                asyncio.ensure_future(self._fetch_twic_games(archive, player_name, semaphore))
+                for archive in archives
+            ]
+            try:
+                for archive, task in zip(archives, pending):
+                    if request.max_games and len(all_games) >= request.max_games:
+                        break
                     
-                except Exception as e:
-                    errors.append(f"Error processing TWIC issue {archive['issue']}: {e}")
-                    continue
+                    try:
+                        all_games.extend(await task)
+                        processed_issues += 1
+                    except Exception as e:
+                        errors.append(f"Error processing TWIC issue {archive['issue']}: {e}")
+            finally:
+                for task in pending:
+                    task.cancel()
             
             # Trim games if we have too many
             if request.max_games and len(all_games) > request.max_games:
                 all_games = all_games[:request.max_games]
             
-            combined_pgn = '\n\n'.join(all_games)
-            
             return FetchResult(
                 success=True,
                 games_count=len(all_games),
-                pgn_content=combined_pgn,
+                pgn_text="",
                 metadata={
                     'player_name': player_name,
                     'twic_issues_processed': processed_issues,
@@ -239,17 +498,19 @@ class FideFetcher(BaseFetcher):
                     'platform': Platform.TWIC,
                     'fetch_date': datetime.now().isoformat(),
                     'source_url': self.TWIC_BASE_URL
-                }
+                },
+                pgn_games=all_games
             )
             
         except Exception as e:
             return FetchResult(
                 success=False,
                 games_count=len(all_games),
-                pgn_content='\n\n'.join(all_games) if all_games else "",
+                pgn_text="",
                 metadata={'player_name': player_name},
                 errors=errors + [f"Fatal error: {e}"],
-                source_info={'platform': Platform.TWIC}
+                source_info={'platform': Platform.TWIC},
+                pgn_games=all_games
             )
     
     async def fetch_games(self, request: FetchRequest) -> FetchResult:
@@ -270,7 +531,7 @@ class FideFetcher(BaseFetcher):
             return FetchResult(
                 success=False,
                 games_count=0,
-                pgn_content="",
+                pgn_text="",
                 metadata={},
                 errors=[f"Platform {request.platform} not yet implemented"],
                 source_info={}
@@ -4,37 +4,57 @@ Official API documentation: https://lichess.org/api
 """
 
 import asyncio
+import logging
+from itertools import chain
 from datetime import datetime, date
 from typing import List, Optional, Dict, Any
 import json
 
 import aiohttp
 import backoff
-from .base import BaseFetcher, FetchRequest, FetchResult, Platform, TimeClass
+from cachetools import TTLCache
+from .base import (
+    BaseFetcher, FetchRequest, FetchResult, Platform, TimeClass, error_body, parse_retry_after
+)
+
+logger = logging.getLogger(__name__)
+
+# Lichess perf types covering each time class
+_LICHESS_PERFS = {
+    TimeClass.BULLET: ('bullet', 'ultraBullet'),
+    TimeClass.BLITZ: ('blitz',),
+    TimeClass.RAPID: ('rapid',),
+    TimeClass.CLASSICAL: ('classical',),
+    TimeClass.CORRESPONDENCE: ('correspondence',),
+}
 
 
 class LichessFetcher(BaseFetcher):
     """Fetcher for Lichess games using their public API."""
     
     BASE_URL = "https://lichess.org/api"
+    TIMEOUT = aiohttp.ClientTimeout(total=60)  # Longer timeout for streaming
+    HEADERS = {
+        'User-Agent': 'AI-Chess-Tournament-Prep-Agent/1.0 (Educational Purpose)',
+        'Accept': 'application/x-ndjson'  # Lichess streams NDJSON
+    }
+    # The games export streams NDJSON or PGN depending on Accept
+    PGN_HEADERS = {**HEADERS, 'Accept': 'application/x-chess-pgn'}
+    STREAM_CHUNK_SIZE = 64 * 1024
+    GAME_DELIMITER = b'\n\n[Event '
+    
+    # Profile cache lifetime, in seconds
+    PROFILE_CACHE_TTL = 3600
     
     def __init__(self):
         super().__init__(rate_limit=2.0)  # Lichess allows 2 req/sec for public API
+        # Raw profile responses keyed by lowercased username
+        self._profile_cache: TTLCache = TTLCache(maxsize=512, ttl=self.PROFILE_CACHE_TTL)
     
     def supports_platform(self, platform: Platform) -> bool:
         """Check if this fetcher supports the given platform."""
         return platform == Platform.LICHESS
     
-    async def __aenter__(self):
-        """Initialize aiohttp session."""
-        timeout = aiohttp.ClientTimeout(total=60)  # Longer timeout for streaming
-        headers = {
-            'User-Agent': 'AI-Chess-Tournament-Prep-Agent/1.0 (Educational Purpose)',
-            'Accept': 'application/x-ndjson'  # Lichess streams NDJSON
-        }
-        self.session = aiohttp.ClientSession(timeout=timeout, headers=headers)
-        return self
-    
     @backoff.on_exception(
         backoff.expo,
         (aiohttp.ClientError, asyncio.TimeoutError),
@@ -45,14 +65,16 @@ class LichessFetcher(BaseFetcher):
         """Make a rate-limited request to Lichess API."""
         await self.rate_limiter.wait()
         
-        async with self.session.get(url, params=params) as response:
+        async with self.session.get(
+            url, params=params, headers=self.HEADERS, timeout=self.TIMEOUT
+        ) as response:
             if response.status == 429:  # Rate limited
-                retry_after = int(response.headers.get('Retry-After', 60))
-                await asyncio.sleep(retry_after)
+                # The retry waits in rate_limiter.wait(); the body is irrelevant
+                self.rate_limiter.pause(parse_retry_after(response.headers.get('Retry-After')))
                 raise aiohttp.ClientError("Rate limited")
             
             if response.status != 200:
-                raise aiohttp.ClientError(f"HTTP {response.status}: {await response.text()}")
+                raise aiohttp.ClientError(f"HTTP {response.status}: {await error_body(response)}")
             
             content_type = response.headers.get('content-type', '')
             if 'application/json' in content_type:
@@ -61,11 +83,18 @@ class LichessFetcher(BaseFetcher):
                 # Return text for streaming/NDJSON responses
                 return {'text': await response.text()}
     
-    async def get_player_info(self, username: str) -> Optional[Dict[str, Any]]:
-        """Get player profile information."""
+    async def get_player_info(self, username: str, refresh: bool = False) -> Optional[Dict[str, Any]]:
+        """Get player profile information.
+        
+        Profiles are cached for PROFILE_CACHE_TTL; ``refresh`` bypasses
+        the cache and stores the new response.
+        """
+        key = username.lower()
         try:
-            url = f"{self.BASE_URL}/user/{username}"
-            data = await self._make_request(url)
+            data = None if refresh else self._profile_cache.get(key)
+            if data is None:
+                data = await self._make_request(f"{self.BASE_URL}/user/{key}")
+                self._profile_cache[key] = data
             
             return {
                 'username': data.get('username'),
@@ -85,7 +114,7 @@ class LichessFetcher(BaseFetcher):
                 'platform': Platform.LICHESS
             }
         except Exception as e:
-            print(f"Error fetching player info for {username}: {e}")
+            logger.warning("Error fetching player info for %s: %s", username, e)
             return None
     
     def _map_lichess_time_class(self, perf_type: str, initial_time: int = 0) -> TimeClass:
@@ -134,31 +163,46 @@ class LichessFetcher(BaseFetcher):
         
         # Add performance types if specified
         if request.time_classes:
-            lichess_perfs = []
-            for time_class in request.time_classes:
-                if time_class == TimeClass.BULLET:
-                    lichess_perfs.extend(['bullet', 'ultraBullet'])
-                elif time_class == TimeClass.BLITZ:
-                    lichess_perfs.append('blitz')
-                elif time_class == TimeClass.RAPID:
-                    lichess_perfs.append('rapid')
-                elif time_class == TimeClass.CLASSICAL:
-                    lichess_perfs.append('classical')
-                elif time_class == TimeClass.CORRESPONDENCE:
-                    lichess_perfs.append('correspondence')
+            lichess_perfs = list(chain.from_iterable(
+                _LICHESS_PERFS.get(time_class, ()) for time_class in request.time_classes
+            ))
             
             if lichess_perfs:
                 params['perfType'] = ','.join(lichess_perfs)
         
         return params
     
+    async def _read_pgn_stream(self, response: aiohttp.ClientResponse) -> List[str]:
+        """Split a streamed PGN export into games as the chunks arrive."""
+        games = []
+        buffer = b''
+        
+        async for chunk in response.content.iter_chunked(self.STREAM_CHUNK_SIZE):
+            buffer += chunk
+            
+            # Emit every game that is followed by the next one's header; the
+            # last (possibly partial) game stays buffered
+            start = 0
+            while (end := buffer.find(self.GAME_DELIMITER, start)) != -1:
+                game = buffer[start:end].strip()
+                if game:
+                    games.append(game.decode('utf-8'))
+                start = end + 2  # Keep '[Event ' with the next game
+            buffer = buffer[start:]
+        
+        game = buffer.strip()
+        if game:
+            games.append(game.decode('utf-8'))
+        
+        return games
+    
     async def fetch_games(self, request: FetchRequest) -> FetchResult:
         """Fetch games for a Lichess player."""
         if not self.supports_platform(request.platform):
             return FetchResult(
                 success=False,
                 games_count=0,
-                pgn_content="",
+                pgn_text="",
                 metadata={},
                 errors=[f"Platform {request.platform} not supported"],
                 source_info={}
@@ -174,7 +218,7 @@ class LichessFetcher(BaseFetcher):
                 return FetchResult(
                     success=False,
                     games_count=0,
-                    pgn_content="",
+                    pgn_text="",
                     metadata={},
                     errors=[f"Player {username} not found"],
                     source_info={}
@@ -188,27 +232,25 @@ class LichessFetcher(BaseFetcher):
             
             await self.rate_limiter.wait()
             
-            async with self.session.get(url, params=params) as response:
+            async with self.session.get(
+                url, params=params, headers=self.PGN_HEADERS, timeout=self.TIMEOUT
+            ) as response:
                 if response.status != 200:
                     return FetchResult(
                         success=False,
                         games_count=0,
-                        pgn_content="",
+                        pgn_text="",
                         metadata=player_info,
-                        errors=[f"HTTP {response.status}: {await response.text()}"],
+                        errors=[f"HTTP {response.status}: {await error_body(response)}"],
                         source_info={'platform': Platform.LICHESS}
                     )
                 
-                # Read the streaming PGN response
-                pgn_content = await response.text()
-                
-                # Count games by counting PGN headers
-                games_count = pgn_content.count('[Event ')
+                games = await self._read_pgn_stream(response)
                 
                 return FetchResult(
                     success=True,
-                    games_count=games_count,
-                    pgn_content=pgn_content,
+                    games_count=len(games),
+                    pgn_text="",
                     metadata={
                         'player_info': player_info,
                         'request_params': params
@@ -218,14 +260,15 @@ class LichessFetcher(BaseFetcher):
                         'platform': Platform.LICHESS,
                         'api_version': 'public',
                         'fetch_date': datetime.now().isoformat()
-                    }
+                    },
+                    pgn_games=games
                 )
         
         except Exception as e:
             return FetchResult(
                 success=False,
                 games_count=0,
-                pgn_content="",
+                pgn_text="",
                 metadata={},
                 errors=errors + [f"Fatal error: {e}"],
                 source_info={'platform': Platform.LICHESS}
@@ -256,5 +299,5 @@ class LichessFetcher(BaseFetcher):
             return 0
             
         except Exception as e:
-            print(f"Error getting games count for {username}: {e}")
+            logger.warning("Error getting games count for %s: %s", username, e)
             return 0
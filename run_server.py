@@ -0,0 +1,33 @@
+"""
+Start the backend API server from the project root.
+
+Set RELOAD=1 to restart the server on code changes while developing.
+"""
+
+import os
+from pathlib import Path
+
+import uvicorn
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+
+
+def main():
+    reload = os.getenv("RELOAD", "0") == "1"
+
+    # Single worker: analysis jobs and caches live in process memory
+    uvicorn.run(
+        "main:app",
+        app_dir=str(PROJECT_ROOT / "backend"),
+        host="0.0.0.0",
+        port=8000,
+        reload=reload,
+        reload_dirs=[str(PROJECT_ROOT)] if reload else None,
+        loop="auto",  # uvloop when installed
+        http="auto",  # httptools when installed
+        log_level="info",
+    )
+
+
+if __name__ == "__main__":
+    main()
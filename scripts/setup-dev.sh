@@ -24,6 +24,9 @@ fi
 
 # Check Python dependencies
 echo "🐍 Checking Python dependencies..."
+echo "📦 Installing project packages (shared, data, ai)..."
+pip install -e .
+
 if python -c "import fastapi, uvicorn, pydantic" 2>/dev/null; then
     echo "✅ Backend dependencies installed"
 else
@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from typing import Dict, List, Optional, Union
 from datetime import datetime
 from enum import Enum
@@ -29,7 +30,9 @@ class GameMetadata(BaseModel):
     eco: Optional[str] = None  # Encyclopedia of Chess Openings
     time_control: Optional[TimeControl] = None
 
-class Move(BaseModel):
+# Only built internally while parsing games, so no validation is needed
+@dataclass(slots=True, frozen=True)
+class Move:
     move_number: int
     white_move: Optional[str] = None
     black_move: Optional[str] = None
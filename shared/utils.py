@@ -2,36 +2,72 @@ from typing import Optional, List
 import re
 from pathlib import Path
 
+_MOVE_NUMBER_RE = re.compile(r'\d+\.')
+_EMAIL_RE = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+_UNSAFE_FILENAME_CHARS_RE = re.compile(r'[^\w\-_.]')
+
+PGN_RESULTS = ("1-0", "0-1", "1/2-1/2", "*")
+# Trailing characters searched for a result before the whole text
+PGN_RESULT_WINDOW = 256
+
+# This would be expanded with a proper ECO database
+COMMON_OPENINGS = {
+    "1.e4 e5": "C20",  # King's Pawn Game
+    "1.e4 c5": "B20",  # Sicilian Defense
+    "1.d4 d5": "D00",  # Queen's Pawn Game
+    "1.Nf3 Nf6": "A04", # Reti Opening
+}
+
+
+def _build_eco_trie(openings: dict) -> dict:
+    """Character trie over opening move strings; a node's ECO code is
+    stored under ``_ECO_KEY``."""
+    trie = {}
+    for opening_moves, eco in openings.items():
+        node = trie
+        for char in opening_moves:
+            node = node.setdefault(char, {})
+        node[_ECO_KEY] = eco
+    return trie
+
+
+# Never a single character, so it can't clash with a move character
+_ECO_KEY = "eco"
+_ECO_TRIE = _build_eco_trie(COMMON_OPENINGS)
+
 class ChessUtils:
     """Utility functions for chess-related operations"""
     
     @staticmethod
     def is_valid_pgn(pgn_content: str) -> bool:
         """Check if PGN content is valid"""
-        if not pgn_content.strip():
+        # isspace() avoids copying the whole text the way strip() would
+        if not pgn_content or pgn_content.isspace():
             return False
         
-        # Basic PGN validation - should contain game metadata and moves
-        has_result = any(result in pgn_content for result in ["1-0", "0-1", "1/2-1/2", "*"])
-        has_moves = bool(re.search(r'\d+\.', pgn_content))
+        # Basic PGN validation - should contain game metadata and moves.
+        # The first move number is near the top and a game's result near
+        # the end, so both checks normally stop early
+        if _MOVE_NUMBER_RE.search(pgn_content) is None:
+            return False
         
-        return has_result and has_moves
+        tail = pgn_content[-PGN_RESULT_WINDOW:]
+        return (any(result in tail for result in PGN_RESULTS)
+                or any(result in pgn_content for result in PGN_RESULTS))
     
     @staticmethod
     def extract_eco_from_moves(moves: str) -> Optional[str]:
         """Extract ECO code from move sequence if possible"""
-        # This would be expanded with a proper ECO database
-        common_openings = {
-            "1.e4 e5": "C20",  # King's Pawn Game
-            "1.e4 c5": "B20",  # Sicilian Defense
-            "1.d4 d5": "D00",  # Queen's Pawn Game
-            "1.Nf3 Nf6": "A04", # Reti Opening
-        }
-        
-        for opening_moves, eco in common_openings.items():
-            if moves.startswith(opening_moves):
-                return eco
-        return None
+        # Walk the trie along the moves, keeping the deepest (most specific)
+        # opening passed on the way
+        node = _ECO_TRIE
+        eco = None
+        for char in moves:
+            node = node.get(char)
+            if node is None:
+                break
+            eco = node.get(_ECO_KEY, eco)
+        return eco
     
     @staticmethod
     def get_game_phase(move_number: int) -> str:
@@ -64,8 +100,7 @@ class ValidationUtils:
     @staticmethod
     def validate_email(email: str) -> bool:
         """Validate email format"""
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return bool(re.match(pattern, email))
+        return _EMAIL_RE.fullmatch(email) is not None
     
     @staticmethod
     def validate_rating(rating: int) -> bool:
@@ -76,7 +111,7 @@ class ValidationUtils:
     def sanitize_filename(filename: str) -> str:
         """Sanitize filename for safe storage"""
         # Remove or replace unsafe characters
-        safe_chars = re.sub(r'[^\w\-_.]', '_', filename)
+        safe_chars = _UNSAFE_FILENAME_CHARS_RE.sub('_', filename)
         return safe_chars[:255]  # Limit length
 
 class FileUtils: